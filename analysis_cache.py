@@ -0,0 +1,159 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_MAX_ENTRIES = int(os.environ.get('SPENDIFY_CACHE_MAX_ENTRIES', '32'))
+DEFAULT_TTL_SECONDS = int(os.environ.get('SPENDIFY_CACHE_TTL', '1800'))
+
+def hash_file(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_frame(df):
+    """Return a SHA-256 hex digest of a DataFrame's column names and contents"""
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def make_cache_key(content_hash, bank_code):
+    """Build the cache key for a statement: content hash plus the bank it was parsed as"""
+    # Kept URL-safe, since chart URLs embed the key
+    return f"{content_hash}-{bank_code or 'auto'}"
+
+class AnalysisCache:
+    """
+    Thread-safe in-memory cache of processed statements.
+
+    Entries hold the typed, classified DataFrame produced by
+    show_data() -> preprocessing_and_analysis() -> classification(), so a
+    hit lets a route skip the whole pipeline, plus the statement summary
+    once it has been computed (see statement_summary). Entries expire after
+    ``ttl_seconds`` and the least recently used entry is evicted once
+    ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at, now):
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        """Return a copy of the cached DataFrame for ``key``, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry['stored_at'], now):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            df = entry['df']
+        # Callers mutate the frame (trans_pred re-sorts it), so never hand out the cached object
+        return df.copy()
+
+    def put(self, key, df, bank_code=None):
+        """Store a processed DataFrame under ``key``, evicting old entries as needed"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = {
+                'df': df.copy(),
+                'bank_code': bank_code,
+                'summary': None,
+                'stored_at': now
+            }
+            self._entries.move_to_end(key)
+
+            # Drop expired entries first, then the least recently used ones
+            for stale_key in [k for k, e in self._entries.items() if self._expired(e['stored_at'], now)]:
+                del self._entries[stale_key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_summary(self, key):
+        """Return the summary stored with ``key``'s statement, or None (callers must not mutate it)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry['stored_at'], now):
+                return None
+            return entry['summary']
+
+    def set_summary(self, key, summary):
+        """Attach a summary to a cached statement; ignored if the statement is no longer cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['summary'] = summary
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+DEFAULT_RENDER_CACHE_BYTES = int(os.environ.get('SPENDIFY_RENDER_CACHE_BYTES', str(64 * 1024 * 1024)))
+
+class RenderCache:
+    """
+    Thread-safe LRU cache of rendered chart images.
+
+    Keys are ``(dataset_key, graph_id, size)`` tuples (or ``('artifact', digest)``
+    for content-addressed images) and values are PNG bytes. The least recently used images are evicted once the total size
+    exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_RENDER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous)
+            self._entries[key] = data
+            self._total_bytes += len(data)
+            # Always keep the newest image, even if it alone exceeds the budget
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
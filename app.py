@@ -1,8 +1,18 @@
-from flask import Flask, render_template, request, redirect, url_for, session
+from flask import Flask, render_template, request, redirect, url_for, session, abort
+import hashlib
 import os
+import uuid
 import pandas as pd
 from werkzeug.utils import secure_filename
-from main import AccountManagementAnalyzer, BANK_CONFIGS
+from main import AccountManagementAnalyzer, BANK_CONFIGS, FORECAST_MODES, get_transaction_classifier, validate_bank_statement
+from analysis_cache import AnalysisCache, RenderCache, hash_frame, make_cache_key
+from enhanced_graphs import GRAPH_SIZES, DEFAULT_GRAPH_SIZE, render_graph
+from transaction_classifier import CategoryMemo
+from forecast_jobs import JobQueue
+from statement_history import StatementHistory, account_id
+from transaction_store import DEFAULT_DB_PATH, TransactionStore
+from serialization import frame_records, to_jsonable
+from statement_summary import summarize
 from flask import Flask, request, jsonify
 import pickle
 import tempfile
@@ -14,18 +24,158 @@ app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')  #
 # Configure upload folder
 UPLOAD_FOLDER = 'uploads'
 STATIC_FOLDER = 'static'  # Folder for graphs
+MEMO_FOLDER = 'category_memos'  # Per-user narration -> category memos
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(STATIC_FOLDER, exist_ok=True)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['STATIC_FOLDER'] = STATIC_FOLDER
+app.config['MEMO_FOLDER'] = MEMO_FOLDER
+# Processed transactions of every upload and account history (SQLite)
+app.config['DATABASE'] = DEFAULT_DB_PATH
 
 # Allowed file types
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Processed statements, keyed by statement content hash and bank code
+analysis_cache = AnalysisCache()
+# Rendered chart PNGs, keyed by (statement cache key, graph id, size)
+render_cache = RenderCache()
+# Background /predict jobs, polled through /predict/status and /predict/result
+forecast_jobs = JobQueue()
+# Persistent transactions, so statements evicted from the cache can be reloaded
+transaction_store = TransactionStore(app.config['DATABASE'])
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def session_user_id():
+    """Return the session's user id, assigning one if needed"""
+    if 'user_id' not in session:
+        session['user_id'] = uuid.uuid4().hex
+    return session['user_id']
+
+def user_memo_path():
+    """Return the session user's category memo path, assigning a user id if needed"""
+    return os.path.join(app.config['MEMO_FOLDER'], f"{session_user_id()}.json")
+
+def user_category_memo():
+    """Load the session user's narration -> category memo"""
+    return CategoryMemo.load(user_memo_path(), get_transaction_classifier().fingerprint)
+
+def statement_account(cache_key):
+    """Store account of a single uploaded statement"""
+    return f"statement-{cache_key}"
+
+def session_cache_key():
+    """Return the analysis cache key for the statement in the session"""
+    return make_cache_key(session['statement_hash'], session.get('bank_code'))
+
+def build_analyzer(cache_key, bank_code=None, store_account=None):
+    """
+    Return an analyzer with a typed, classified df for a statement, or None.
+
+    Reuses the cached result when the same statement has already been processed,
+    otherwise loads it once from the transaction store and caches it. Returns
+    None when the statement is neither cached nor stored.
+    Takes plain values rather than the session, so background jobs can call it too.
+    """
+    analyzer = AccountManagementAnalyzer()
+
+    if bank_code:
+        analyzer.bank_code = bank_code
+        analyzer.bank_config = BANK_CONFIGS[bank_code]
+
+    cached_df = analysis_cache.get(cache_key)
+    if cached_df is not None:
+        analyzer.df = cached_df
+        return analyzer
+
+    if not store_account:
+        return None
+    # Stored transactions are already processed and classified
+    stored_df = transaction_store.read(store_account)
+    if stored_df.empty:
+        return None
+    analyzer.df = stored_df
+    analysis_cache.put(cache_key, analyzer.df, analyzer.bank_code)
+    return analyzer
+
+def load_analyzer():
+    """Return an analyzer for the statement in the session, or send the user back to upload it"""
+    analyzer = build_analyzer(session_cache_key(), session.get('bank_code'), session.get('store_account'))
+    if analyzer is None:
+        # Neither cached nor stored: ask for the statement again
+        session.pop('statement_hash', None)
+        abort(redirect(url_for('index')))
+    return analyzer
+
+def report_range():
+    """Parse the optional ?start=&end= transaction date range (YYYY-MM-DD) of a page"""
+    try:
+        return tuple(pd.Timestamp(request.args[name]) if request.args.get(name) else None
+                     for name in ('start', 'end'))
+    except ValueError:
+        abort(400)
+
+def load_transactions(start=None, end=None, columns=None):
+    """
+    Return the session statement's transactions dated between ``start`` and
+    ``end`` (inclusive), limited to ``columns``.
+
+    Rows come in date order, same-day rows in statement order, whichever
+    source serves them, so row positions (the /api/transactions cursor) stay
+    valid across a cache eviction. Served from the analysis cache when the
+    statement is there. Otherwise a date range is read from the transaction
+    store on its own, and a whole statement is reloaded and cached again.
+    """
+    df = analysis_cache.get(session_cache_key())
+    if df is None:
+        if start is None and end is None:
+            df = load_analyzer().df  # Puts the reloaded statement back in the cache
+        else:
+            if not session.get('store_account'):
+                abort(redirect(url_for('index')))
+            return transaction_store.read(session['store_account'], start, end, columns=columns)
+
+    # The store's order; statements listed newest first are cached as extracted
+    if not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date', kind='stable')
+
+    in_range = pd.Series(True, index=df.index)
+    if start is not None:
+        in_range &= df['Date'] >= start
+    if end is not None:
+        in_range &= df['Date'] < end + pd.Timedelta(days=1)
+    if columns is not None:
+        df = df[[column for column in df.columns if column in columns]]
+    return df[in_range].reset_index(drop=True)
+
+def statement_summary(df=None, start=None, end=None):
+    """
+    Return the summary (see statement_summary.summarize) of the session statement,
+    or of its ``start``..``end`` date range.
+
+    The whole-statement summary is kept with the statement in the analysis cache
+    and in the transaction store (account histories keep theirs up to date as
+    statements are added), so it is only computed from the transactions when
+    neither has it; ``df`` saves reloading transactions the caller already has.
+    """
+    if start is not None or end is not None:
+        return summarize(df if df is not None else load_transactions(start, end))
+    key = session_cache_key()
+    summary = analysis_cache.get_summary(key)
+    if summary is None and session.get('store_account'):
+        summary, _ = transaction_store.load_summary(session['store_account'])
+    if summary is None:
+        summary = summarize(df if df is not None else load_analyzer().df)
+    analysis_cache.set_summary(key, summary)
+    return summary
+
+def session_bank_name():
+    bank_code = session.get('bank_code')
+    return BANK_CONFIGS[bank_code]['name'] if bank_code in BANK_CONFIGS else 'Unknown'
+
 @app.route('/health')
 def health_check():
     return jsonify({
@@ -49,6 +199,7 @@ def upload_file():
     file = request.files['file']
     password = request.form.get('password', '')  # Get password input
     selected_bank = request.form.get('bank', 'HDFC')  # Get selected bank
+    append_history = request.form.get('append_history') == 'on'  # Add to the account's history
 
     if not file or not file.filename:
         return redirect(request.url)
@@ -67,14 +218,19 @@ def upload_file():
             return jsonify({'error': str(e)}), 400
         
         if unprotected_pdf:
-            csv_file = analyzer.analyze(unprotected_pdf)  # Convert PDF to CSV
-            if csv_file:
+            # Check the first page's header before paying for a full extraction
+            try:
+                analyzer.preflight(unprotected_pdf, selected_bank)
+            except ValueError as e:
+                return render_template("error.html", 
+                                     error_message=f"Bank Statement Validation Error: {e}", 
+                                     filename=filename)
+
+            raw_df = analyzer.analyze(unprotected_pdf)  # Extract PDF tables
+            if raw_df is not None:
                 # Validate bank selection before processing
                 if selected_bank != 'auto':
-                    # Load data to validate bank format
-                    temp_df = pd.read_csv(csv_file)
-                    from main import validate_bank_statement
-                    is_valid, error_message = validate_bank_statement(temp_df, selected_bank)
+                    is_valid, error_message = validate_bank_statement(raw_df, selected_bank)
                     if not is_valid:
                         return render_template("error.html", 
                                              error_message=f"Bank Statement Validation Error: {error_message}", 
@@ -85,16 +241,44 @@ def upload_file():
                 
                 try:
                     df = analyzer.show_data()
-                    analyzer.preprocessing_and_analysis()
-                    analyzer.classification()
+                    analyzer.preprocessing_and_analysis(render_graphs=False)
+
+                    if append_history:
+                        # Only rows the account history lacks are classified and added
+                        memo = user_category_memo()
+                        account = account_id(session_user_id(), analyzer.bank_code)
+                        history = StatementHistory(account, transaction_store)
+                        classifier = get_transaction_classifier()
+                        added = history.append_statement(
+                            analyzer.df, lambda rows: classifier.classify_series(rows['Narration'].astype(str), memo=memo))
+                        memo.save()
+                        history.save()
+
+                        # Keyed by the history's version rather than its contents, so the history is
+                        # neither re-read nor re-hashed here; views load it from the store on demand
+                        content_hash = hashlib.sha256(f"{account}:{history.version}".encode()).hexdigest()
+                        session['store_account'] = account
+                        df = added  # Show what this upload added
+                        filename = f"{filename} ({len(added)} new of {len(raw_df)} transactions added, {len(history)} in history)"
+                    else:
+                        analyzer.classification(memo=user_category_memo())
+                        content_hash = hash_frame(raw_df)
+                        cache_key = make_cache_key(content_hash, analyzer.bank_code)
+                        summary = summarize(analyzer.df)
+                        # Content-addressed, so re-uploading the same statement rewrites the same rows
+                        account = statement_account(cache_key)
+                        transaction_store.write(account, analyzer.df, replace=True, summary=summary)
+                        session['store_account'] = account
+                        analysis_cache.put(cache_key, analyzer.df, analyzer.bank_code)
+                        analysis_cache.set_summary(cache_key, summary)
 
-                    # Store csv_file and bank info in session for later use in prediction
-                    session['csv_file'] = csv_file
+                    # Store the statement hash and bank info in session for later use in prediction
+                    session['statement_hash'] = content_hash
                     session['bank_code'] = analyzer.bank_code
 
                     table_html = df.to_html(classes='table table-striped')
 
-                    return render_template("result.html", filename=filename, table_html=table_html, bank_name=analyzer.bank_config['name'], show_download=True)
+                    return render_template("result.html", filename=filename, table_html=table_html, bank_name=analyzer.bank_config['name'], show_download=True, dataset_key=session_cache_key())
                 except ValueError as e:
                     # Handle validation errors
                     error_message = str(e)
@@ -105,30 +289,66 @@ def upload_file():
 
     return redirect(url_for('index'))
 
+def png_response(png, etag):
+    from flask import make_response
+    response = make_response(png)
+    response.headers['Content-Type'] = 'image/png'
+    # Chart URLs are per dataset (or content-addressed), so their bytes never change
+    response.headers['Cache-Control'] = 'private, max-age=86400, immutable'
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def publish_chart(png):
+    """Store a rendered chart under its content hash and return its URL"""
+    digest = hashlib.sha256(png).hexdigest()
+    render_cache.put(('artifact', digest), png)
+    return url_for('chart_artifact', digest=digest)
+
+@app.route('/graph/<dataset_key>/<int:graph_id>')
+def graph(dataset_key, graph_id):
+    """Render one statement chart on demand, reusing previously rendered images"""
+    if 'statement_hash' not in session or dataset_key != session_cache_key():
+        abort(404)
+
+    size = request.args.get('size', DEFAULT_GRAPH_SIZE)
+    if size not in GRAPH_SIZES:
+        abort(400)
+
+    render_key = (dataset_key, graph_id, size)
+    png = render_cache.get(render_key)
+    if png is None:
+        analyzer = load_analyzer()
+        try:
+            png = render_graph(analyzer.df, graph_id, size=size)
+        except KeyError:
+            abort(404)
+        render_cache.put(render_key, png)
+
+    return png_response(png, f"{dataset_key}-{graph_id}-{size}")
+
+@app.route('/chart/<digest>')
+def chart_artifact(digest):
+    """Serve a content-addressed chart, such as the budget charts from /predict"""
+    png = render_cache.get(('artifact', digest))
+    if png is None:
+        abort(404)
+    return png_response(png, digest)
+
 @app.route('/simple_report')
 def simple_report():
-    if 'csv_file' not in session:
+    if 'statement_hash' not in session:
         return redirect(url_for('index'))
     
-    analyzer = AccountManagementAnalyzer()
-    analyzer.csv_file = session['csv_file']
-    
-    if 'bank_code' in session:
-        analyzer.bank_code = session['bank_code']
-        analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-    
-    analyzer.show_data()
-    analyzer.preprocessing_and_analysis()
-    analyzer.classification()
-    
-    # Generate report data
-    df = analyzer.df
-    total_withdrawals = df['Withdrawal Amount'].sum()
-    total_deposits = df['Deposit Amount'].sum()
-    current_balance = df['Closing Balance'].iloc[-1]
+    # Only the requested period (?start=&end=, default all) is loaded
+    start, end = report_range()
+    df = load_transactions(start, end)
+    summary = statement_summary(df, start, end)
+    total_withdrawals = summary['total_withdrawals']
+    total_deposits = summary['total_deposits']
+    current_balance = summary['current_balance']
     
     # Category analysis
-    category_counts = df['Category'].value_counts().to_dict()
+    category_counts = summary['category_counts']
     
     # Create simple HTML report
     report_html = f"""
@@ -149,7 +369,7 @@ def simple_report():
     <body>
         <div class="header">
             <h1>SPENDIFY Financial Analysis Report</h1>
-            <h3>Bank: {analyzer.bank_config['name'] if analyzer.bank_config else 'Unknown'}</h3>
+            <h3>Bank: {session_bank_name()}</h3>
         </div>
         
         <div class="summary">
@@ -179,48 +399,22 @@ def simple_report():
 
 @app.route('/download_report')
 def download_report():
-    if 'csv_file' not in session:
+    if 'statement_hash' not in session:
         return redirect(url_for('index'))
     
-    analyzer = AccountManagementAnalyzer()
-    analyzer.csv_file = session['csv_file']
-    
-    if 'bank_code' in session:
-        analyzer.bank_code = session['bank_code']
-        analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-    
-    analyzer.show_data()
-    analyzer.preprocessing_and_analysis()
-    analyzer.classification()
-    
-    # Generate report data
-    df = analyzer.df
-    total_withdrawals = df['Withdrawal Amount'].sum()
-    total_deposits = df['Deposit Amount'].sum()
-    current_balance = df['Closing Balance'].iloc[-1]
+    # Only the requested period (?start=&end=, default all) is loaded
+    start, end = report_range()
+    df = load_transactions(start, end)
+    summary = statement_summary(df, start, end)
+    total_withdrawals = summary['total_withdrawals']
+    total_deposits = summary['total_deposits']
+    current_balance = summary['current_balance']
     
     # Category analysis
-    category_counts = df['Category'].value_counts().to_dict()
+    category_counts = summary['category_counts']
     
     # Monthly analysis
-    df['Date'] = pd.to_datetime(df['Date'])
-    monthly_data = df.groupby(df['Date'].dt.to_period('M')).agg({
-        'Withdrawal Amount': 'sum',
-        'Deposit Amount': 'sum'
-    }).reset_index()
-    monthly_data['Month'] = monthly_data['Date'].astype(str)
-    # Convert to JSON serializable format
-    monthly_records = []
-    for _, row in monthly_data.iterrows():
-        monthly_records.append({
-            'Month': row['Month'],
-            'Withdrawal Amount': float(row['Withdrawal Amount']),
-            'Deposit Amount': float(row['Deposit Amount'])
-        })
-    
-    # Top transactions
-    top_withdrawals = df.nlargest(5, 'Withdrawal Amount')[['Date', 'Narration', 'Withdrawal Amount']]
-    top_deposits = df.nlargest(5, 'Deposit Amount')[['Date', 'Narration', 'Deposit Amount']]
+    monthly_records = summary['monthly']
     
     # Create interactive HTML report
     report_html = f"""
@@ -255,7 +449,7 @@ def download_report():
         <div class="container">
             <div class="header">
                 <h1>📊 SPENDIFY Interactive Financial Report</h1>
-                <h3>Bank: {analyzer.bank_config['name'] if analyzer.bank_config else 'Unknown'}</h3>
+                <h3>Bank: {session_bank_name()}</h3>
                 <p>Generated on: {pd.Timestamp.now().strftime('%B %d, %Y at %I:%M %p')}</p>
             </div>
             
@@ -445,95 +639,123 @@ def download_report():
     response.headers['Content-Disposition'] = 'attachment; filename=spendify_interactive_report.html'
     return response
 
+def run_forecast_job(report, cache_key, bank_code, store_account, future_days, forecast_mode, threshold):
+    """Background forecast for /predict; takes plain values since it runs outside the request"""
+    report(0.1, 'Loading statement')
+    analyzer = build_analyzer(cache_key, bank_code, store_account)
+    if analyzer is None:
+        raise LookupError('The statement has expired, please upload it again')
+
+    report(0.3, 'Forecasting balance')
+    current_balance, prediction_df = analyzer.trans_pred(future_days, mode=forecast_mode, threshold=threshold)
+    predicted_balance = prediction_df["ARIMA_Prediction"].iloc[-1]
+
+    report(0.8, 'Building budget')
+    budget_data = analyzer.budget_system()
+
+    simulation = analyzer.simulation
+
+    return {
+        'success': True, 
+        'days': future_days,
+        'mode': forecast_mode,
+        'current_balance': f"₹{float(current_balance):.2f}",
+        'predicted_balance': f"₹{float(predicted_balance):.2f}",
+        'prediction_data': frame_records(prediction_df),
+        'budget_data': to_jsonable(budget_data),
+        'simulation': {
+            'threshold': simulation['threshold'],
+            'probability_below': simulation['probability_below'],
+            'paths': simulation['paths'],
+            'bands': frame_records(simulation['bands'])
+        },
+        # PNG bytes; /predict/result publishes them as chart URLs
+        'budget_charts': {
+            'expense_breakdown': analyzer.charts[10],
+            'allocation': analyzer.charts[11]
+        }
+    }
+
 @app.route('/predict', methods=['POST'])
 def predict():
+    """Queue a forecast for the session's statement and return its job id"""
     prediction_days = request.form.get('days', '30')
     try:
         future_days = int(prediction_days)
     except ValueError:
         future_days = 30
+    # 'fast' swaps the trained models for the NumPy-only forecasts
+    forecast_mode = request.form.get('mode', 'full')
+    if forecast_mode not in FORECAST_MODES:
+        forecast_mode = 'full'
+    # Balance level the simulation reports the chance of falling below
+    try:
+        threshold = float(request.form.get('threshold', '0') or 0)
+    except ValueError:
+        threshold = 0.0
     
-    if 'csv_file' in session:
-        analyzer = AccountManagementAnalyzer()
-        analyzer.csv_file = session['csv_file']
-        
-        # Restore bank configuration from session
-        if 'bank_code' in session:
-            analyzer.bank_code = session['bank_code']
-            analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-        
-        analyzer.show_data()
-        analyzer.preprocessing_and_analysis()
-        analyzer.classification()
-        
-        current_balance, prediction_df = analyzer.trans_pred(future_days)
-        predicted_balance = prediction_df["ARIMA_Prediction"].iloc[-1]
-        
-        budget_data = analyzer.budget_system()
-        
-        session['future_days'] = future_days
-        
-        # Convert prediction_df to dict and ensure all values are JSON serializable
-        prediction_data = prediction_df.to_dict(orient='records')
-        
-        # Convert NumPy types to native Python types in prediction_data
-        for record in prediction_data:
-            for key, value in record.items():
-                if hasattr(value, 'item'):  # Check if it's a NumPy type
-                    record[key] = value.item()
-                elif isinstance(value, (np.integer, np.floating)):
-                    record[key] = value.item()
-        
-        # Convert NumPy types in budget_data
-        if budget_data:
-            for key, value in budget_data.items():
-                if isinstance(value, dict):
-                    for sub_key, sub_value in value.items():
-                        if hasattr(sub_value, 'item'):
-                            budget_data[key][sub_key] = sub_value.item()
-                        elif isinstance(sub_value, (np.integer, np.floating)):
-                            budget_data[key][sub_key] = sub_value.item()
-                elif hasattr(value, 'item'):
-                    budget_data[key] = value.item()
-                elif isinstance(value, (np.integer, np.floating)):
-                    budget_data[key] = value.item()
-        
-        return jsonify({
-            'success': True, 
-            'days': future_days,
-            'current_balance': f"₹{float(current_balance):.2f}",
-            'predicted_balance': f"₹{float(predicted_balance):.2f}",
-            'prediction_data': prediction_data,
-            'budget_data': budget_data
-        })
-    
-    return jsonify({'success': False, 'error': 'No data available for prediction'})
+    if 'statement_hash' not in session:
+        return jsonify({'success': False, 'error': 'No data available for prediction'})
+
+    session['future_days'] = future_days
+    # The job runs outside the request, so hand it plain values instead of the session
+    job_id = forecast_jobs.submit(
+        run_forecast_job, session_cache_key(), session.get('bank_code'), session.get('store_account'),
+        future_days, forecast_mode, threshold, owner=session_user_id()
+    )
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('predict_status', job_id=job_id),
+        'result_url': url_for('predict_result', job_id=job_id)
+    }), 202
+
+def session_forecast_job(job_id):
+    job = forecast_jobs.get(job_id, owner=session.get('user_id'))
+    if job is None:
+        abort(404)
+    return job
+
+@app.route('/predict/status/<job_id>')
+def predict_status(job_id):
+    job = session_forecast_job(job_id)
+    return jsonify({
+        'success': job['status'] != 'failed',
+        'job_id': job_id,
+        'status': job['status'],
+        'progress': job['progress'],
+        'message': job['message'],
+        'error': job['error']
+    })
+
+@app.route('/predict/result/<job_id>')
+def predict_result(job_id):
+    job = session_forecast_job(job_id)
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'error': job['error']})
+    if job['status'] != 'done':
+        return jsonify({'success': False, 'status': job['status'], 'error': 'Forecast is still running'}), 409
+
+    result = dict(job['result'])
+    result['budget_charts'] = {name: publish_chart(png) for name, png in result['budget_charts'].items()}
+    return jsonify(result)
 
 @app.route('/analysis')
 def analysis():
-    if 'csv_file' not in session:
+    if 'statement_hash' not in session:
         return redirect(url_for('index'))
     
-    analyzer = AccountManagementAnalyzer()
-    analyzer.csv_file = session['csv_file']
-    
-    if 'bank_code' in session:
-        analyzer.bank_code = session['bank_code']
-        analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-    
-    analyzer.show_data()
-    analyzer.preprocessing_and_analysis()
-    analyzer.classification()
+    analyzer = load_analyzer()
     
     df = analyzer.df
     table_html = df.to_html(classes='table table-striped')
     bank_name = analyzer.bank_config['name'] if analyzer.bank_config else 'Unknown'
     
-    return render_template("result.html", filename="Analysis Results", table_html=table_html, bank_name=bank_name, show_download=True)
+    return render_template("result.html", filename="Analysis Results", table_html=table_html, bank_name=bank_name, show_download=True, dataset_key=session_cache_key())
 
 @app.route('/assistant', methods=['POST'])
 def assistant():
-    if 'csv_file' not in session:
+    if 'statement_hash' not in session:
         return jsonify({'error': 'No data available'})
     
     question = request.json.get('question', '')
@@ -541,83 +763,102 @@ def assistant():
     try:
         from financial_agent import get_financial_advice
         
-        analyzer = AccountManagementAnalyzer()
-        analyzer.csv_file = session['csv_file']
-        
-        if 'bank_code' in session:
-            analyzer.bank_code = session['bank_code']
-            analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-        
-        analyzer.show_data()
-        analyzer.preprocessing_and_analysis()
-        analyzer.classification()
-        
         # Use LangGraph agent for intelligent response
-        response = get_financial_advice(question, analyzer.df)
+        response = get_financial_advice(question, summary=statement_summary())
         return jsonify({'response': response})
         
     except Exception as e:
         return jsonify({'error': f'Error: {str(e)}'})
 
+DASHBOARD_COLUMNS = ['Date', 'Narration', 'Withdrawal Amount', 'Deposit Amount', 'Closing Balance', 'Category']
+
 @app.route('/dashboard')
 def dashboard():
-    if 'csv_file' not in session:
+    if 'statement_hash' not in session:
         return redirect(url_for('index'))
     
-    analyzer = AccountManagementAnalyzer()
-    analyzer.csv_file = session['csv_file']
-    
-    if 'bank_code' in session:
-        analyzer.bank_code = session['bank_code']
-        analyzer.bank_config = BANK_CONFIGS[session['bank_code']]
-    
-    analyzer.show_data()
-    analyzer.preprocessing_and_analysis()
-    analyzer.classification()
-    
-    df = analyzer.df
+    # The whole statement's summary is cached; a ?start=&end= period loads and
+    # summarises only that range (and the columns the summary needs)
+    start, end = report_range()
+    df = load_transactions(start, end, columns=DASHBOARD_COLUMNS) if start is not None or end is not None else None
+    summary = statement_summary(df, start, end)
     
     # Prepare data for dashboard
     dashboard_data = {
-        'total_withdrawals': float(df['Withdrawal Amount'].sum()),
-        'total_deposits': float(df['Deposit Amount'].sum()),
-        'current_balance': float(df['Closing Balance'].iloc[-1]),
-        'transaction_count': len(df),
-        'categories': df['Category'].value_counts().to_dict(),
-        'bank_name': analyzer.bank_config['name'] if analyzer.bank_config else 'Unknown'
+        'current_balance': summary['current_balance'],
+        'bank_name': session_bank_name(),
+        'total_withdrawals': summary['total_withdrawals'],
+        'total_deposits': summary['total_deposits'],
+        'transaction_count': summary['transaction_count'],
+        'categories': summary['category_counts'],
+        'monthly_data': summary['monthly']
     }
-    
-    # Monthly data
-    df['Date'] = pd.to_datetime(df['Date'])
-    monthly_data = df.groupby(df['Date'].dt.to_period('M')).agg({
-        'Withdrawal Amount': 'sum',
-        'Deposit Amount': 'sum'
-    }).reset_index()
-    monthly_data['Month'] = monthly_data['Date'].astype(str)
-    # Convert to dict and ensure JSON serializable
-    monthly_records = []
-    for _, row in monthly_data.iterrows():
-        monthly_records.append({
-            'Month': row['Month'],
-            'Withdrawal Amount': float(row['Withdrawal Amount']),
-            'Deposit Amount': float(row['Deposit Amount'])
-        })
-    dashboard_data['monthly_data'] = monthly_records
-    
-    # All transactions - ensure JSON serializable
-    all_df = df[['Date', 'Narration', 'Withdrawal Amount', 'Deposit Amount', 'Category']].copy()
-    all_transactions = []
-    for _, row in all_df.iterrows():
-        all_transactions.append({
-            'Date': row['Date'].strftime('%Y-%m-%d') if pd.notna(row['Date']) else '',
-            'Narration': str(row['Narration']),
-            'Withdrawal Amount': float(row['Withdrawal Amount']) if pd.notna(row['Withdrawal Amount']) else 0.0,
-            'Deposit Amount': float(row['Deposit Amount']) if pd.notna(row['Deposit Amount']) else 0.0,
-            'Category': str(row['Category'])
-        })
-    dashboard_data['all_transactions'] = all_transactions
+
+    # The transaction table pages through /api/transactions
+    dashboard_data['range'] = {'start': request.args.get('start', ''), 'end': request.args.get('end', '')}
     
     return render_template('dashboard.html', data=dashboard_data)
 
+TRANSACTION_COLUMNS = ['Date', 'Narration', 'Withdrawal Amount', 'Deposit Amount', 'Category']
+TRANSACTIONS_PAGE_SIZE = 100
+TRANSACTIONS_MAX_PAGE_SIZE = 500
+
+def filter_transactions(df, categories=None, min_amount=None, max_amount=None, text=None):
+    """Boolean mask of the rows matching every given filter, evaluated column-wise"""
+    mask = pd.Series(True, index=df.index)
+    if categories:
+        mask &= df['Category'].isin(categories)
+    if min_amount is not None or max_amount is not None:
+        # A row's amount is whichever side of the ledger it is on
+        amount = df[['Withdrawal Amount', 'Deposit Amount']].max(axis=1)
+        if min_amount is not None:
+            mask &= amount >= min_amount
+        if max_amount is not None:
+            mask &= amount <= max_amount
+    if text:
+        mask &= (df['Narration'].fillna('').str.contains(text, case=False, regex=False)
+                 | df['Category'].fillna('').str.contains(text, case=False, regex=False))
+    return mask
+
+def optional_float(name):
+    value = request.args.get(name, '')
+    try:
+        return float(value) if value else None
+    except ValueError:
+        abort(400)
+
+@app.route('/api/transactions')
+def api_transactions():
+    """
+    One page of the session statement's transactions, in date order (same-day rows in statement order).
+
+    Filters: start/end (YYYY-MM-DD), category (repeatable), min_amount/max_amount, q (text).
+    Pass the returned next_cursor as ?cursor= for the following page; it is None on the last one.
+    """
+    if 'statement_hash' not in session:
+        return jsonify({'error': 'No data available'}), 404
+
+    try:
+        cursor = int(request.args.get('cursor', 0))
+        limit = int(request.args.get('limit', TRANSACTIONS_PAGE_SIZE))
+    except ValueError:
+        abort(400)
+    limit = max(1, min(limit, TRANSACTIONS_MAX_PAGE_SIZE))
+
+    df = load_transactions(*report_range(), columns=TRANSACTION_COLUMNS)
+    mask = filter_transactions(df, request.args.getlist('category'), optional_float('min_amount'),
+                               optional_float('max_amount'), request.args.get('q', '').strip())
+    # The cursor is a row position in the range, so pages stay put whatever the filters match
+    positions = np.flatnonzero(mask.to_numpy())
+    remaining = positions[positions >= cursor]
+    page_positions = remaining[:limit]
+
+    page = df.iloc[page_positions]
+    return jsonify({
+        'transactions': frame_records(page.fillna({'Narration': '', 'Category': ''})),
+        'next_cursor': int(page_positions[-1]) + 1 if len(remaining) > limit else None,
+        'matched': int(len(positions))
+    })
+
 if __name__ == '__main__':
     app.run(debug=True, use_reloader=False)
\ No newline at end of file
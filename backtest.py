@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Rolling-origin backtest of SPENDIFY's balance forecasters.
+
+Every model is refitted at many forecast origins along a daily balance
+series; each fit forecasts the next ``horizon`` days and is scored against
+what actually happened, using the MSME/RMAE metrics trans_pred() reports.
+Folds are independent, so they are spread over a process pool.
+
+Usage: python backtest.py [--models holt,ar,arima,lstm] [--horizon 30] [--step 7]
+                          [--min-train 60] [--workers N] [--output backtest_metrics.csv]
+                          [--password PW] [statement.pdf ...]
+       (without statements, a synthetic salary/spending series is used)
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from daily_series import daily_series
+from main import (AccountManagementAnalyzer, FORECAST_CONFIG, FORECAST_SEQ_LENGTH,
+                  ar_forecast, forecast_metrics, holt_forecast, make_lstm_rollout)
+
+DEFAULT_WORKERS = int(os.environ.get('SPENDIFY_BACKTEST_WORKERS', str(os.cpu_count() or 1)))
+
+def arima_forecast(train, steps):
+    """ARIMA(5,1,0) forecast, as in trans_pred(mode='full')"""
+    from statsmodels.tsa.arima.model import ARIMA
+    return np.asarray(ARIMA(train, order=FORECAST_CONFIG['arima_order']).fit().forecast(steps=steps))
+
+def lstm_forecast(train, steps):
+    """
+    Two-layer LSTM trained from scratch the way trans_pred(mode='full') trains it:
+    fitted on the first 80% of the windows and rolled out from the last window,
+    which (as in trans_pred) ends one day before the end of the series.
+    """
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.models import Sequential
+
+    seq_length = FORECAST_SEQ_LENGTH
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    data = scaler.fit_transform(np.asarray(train, dtype=float).reshape(-1, 1))
+    X = np.lib.stride_tricks.sliding_window_view(data[:-1], seq_length, axis=0).transpose(0, 2, 1)
+    y = data[seq_length:]
+    train_size = int(len(X) * 0.8)
+
+    model = Sequential([
+        LSTM(FORECAST_CONFIG['lstm_units'], return_sequences=True),
+        LSTM(FORECAST_CONFIG['lstm_units']),
+        Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    model.fit(X[:train_size], y[:train_size], epochs=FORECAST_CONFIG['epochs'],
+              batch_size=FORECAST_CONFIG['batch_size'], verbose=0)
+    window = tf.constant(X[-1][np.newaxis], dtype=tf.float32)
+    predictions = make_lstm_rollout(model)(window, tf.constant(steps)).numpy()
+    return scaler.inverse_transform(predictions.reshape(-1, 1)).ravel()
+
+# name -> (backend, forecast(train, steps), module that must be importable)
+FORECASTERS = {
+    'holt': ('fast', holt_forecast, None),
+    'ar': ('fast', ar_forecast, None),
+    'arima': ('full', arima_forecast, 'statsmodels'),
+    'lstm': ('full', lstm_forecast, 'tensorflow'),
+}
+
+def forecaster_available(name):
+    module = FORECASTERS[name][2]
+    if module is None:
+        return True
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+def synthetic_series(days=365, seed=0):
+    """A year of daily closing balances: monthly salary, daily spending and a few large bills"""
+    rng = np.random.default_rng(seed)
+    changes = -rng.gamma(2.0, 400.0, days)
+    changes[::30] += 60000
+    changes[rng.choice(days, 6, replace=False)] -= rng.uniform(5000, 20000, 6)
+    return pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=days, freq="D"),
+        "Closing Balance": 50000 + np.cumsum(changes)
+    })
+
+def statement_series(pdf_path, password=None):
+    """Daily balance series of a statement, prepared exactly as /predict prepares it"""
+    analyzer = AccountManagementAnalyzer()
+    if password:
+        analyzer.remove_pdf_password(pdf_path, password)
+    if analyzer.analyze(pdf_path) is None:
+        raise SystemExit(f"Could not extract transactions from {pdf_path}")
+    analyzer.show_data()
+    analyzer.preprocessing_and_analysis(render_graphs=False)
+    return daily_series(analyzer.df)
+
+def rolling_origins(length, horizon, step, min_train):
+    """Forecast origins (training lengths) whose full horizon lies inside the series"""
+    return list(range(min_train, length - horizon + 1, step))
+
+def run_fold(task):
+    """Fit one model at one origin and score its forecast; runs in a pool worker"""
+    series_name, model_name, origin, train, actual = task
+    start = time.perf_counter()
+    try:
+        predicted = FORECASTERS[model_name][1](train, len(actual))
+        scores = forecast_metrics(actual, predicted)
+        error = ''
+    except Exception as e:
+        scores = {'msme': float('nan'), 'rmae': float('nan')}
+        error = str(e)
+    return {
+        'series': series_name,
+        'model': model_name,
+        'origin': origin,
+        'train_days': len(train),
+        'horizon': len(actual),
+        'msme': scores['msme'],
+        'rmae': scores['rmae'],
+        'seconds': time.perf_counter() - start,
+        'error': error
+    }
+
+def backtest(series, models, horizon=30, step=7, min_train=60, workers=DEFAULT_WORKERS):
+    """
+    Run every model over every rolling origin of each series.
+
+    ``series`` maps a name to a daily frame with Date and Closing Balance.
+    Returns one result dict per (series, model, origin) fold.
+    """
+    tasks = []
+    for series_name, daily in series.items():
+        balances = daily["Closing Balance"].to_numpy(dtype=float)
+        dates = daily["Date"].dt.strftime('%Y-%m-%d').to_numpy()
+        for origin in rolling_origins(len(balances), horizon, step, min_train):
+            for model_name in models:
+                tasks.append((series_name, model_name, dates[origin],
+                              balances[:origin], balances[origin:origin + horizon]))
+
+    if workers <= 1 or len(tasks) <= 1:
+        return [run_fold(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results come back in task order, so the table is stable across runs
+        return list(pool.map(run_fold, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+def write_metrics(results, output_path):
+    fields = ['series', 'model', 'origin', 'train_days', 'horizon', 'msme', 'rmae', 'seconds', 'error']
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+def summarize(results):
+    """Mean metrics per series and model"""
+    table = pd.DataFrame(results)
+    return table.groupby(['series', 'model'], sort=False).agg(
+        folds=('origin', 'size'),
+        failed=('error', lambda errors: int((errors != '').sum())),
+        msme=('msme', 'mean'),
+        rmae=('rmae', 'mean'),
+        seconds=('seconds', 'sum')
+    ).reset_index()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('statements', nargs='*')
+    parser.add_argument('--models', default=','.join(FORECASTERS), help='comma-separated models to backtest')
+    parser.add_argument('--horizon', type=int, default=30, help='days forecast at each origin')
+    parser.add_argument('--step', type=int, default=7, help='days between origins')
+    parser.add_argument('--min-train', type=int, default=60, help='days of history at the first origin')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--output', default='backtest_metrics.csv')
+    parser.add_argument('--password', help='password for encrypted statements')
+    args = parser.parse_args()
+
+    models = []
+    for name in args.models.split(','):
+        if name not in FORECASTERS:
+            parser.error(f"unknown model '{name}' (choose from {', '.join(FORECASTERS)})")
+        if forecaster_available(name):
+            models.append(name)
+        else:
+            print(f"Skipping {name}: {FORECASTERS[name][2]} is not installed")
+
+    if args.statements:
+        series = {os.path.basename(path): statement_series(path, args.password) for path in args.statements}
+    else:
+        series = {'synthetic': synthetic_series()}
+
+    start = time.perf_counter()
+    results = backtest(series, models, args.horizon, args.step, args.min_train, args.workers)
+    write_metrics(results, args.output)
+
+    print(summarize(results).to_string(index=False))
+    print(f"\n{len(results)} folds in {time.perf_counter() - start:.1f}s, metrics written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_PATHS = int(os.environ.get('SPENDIFY_SIMULATION_PATHS', '10000'))
+DEFAULT_BLOCK_DAYS = int(os.environ.get('SPENDIFY_SIMULATION_BLOCK_DAYS', '7'))
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+def simulate_balances(daily, days, paths=DEFAULT_PATHS, block_days=DEFAULT_BLOCK_DAYS,
+                      threshold=0.0, seed=None):
+    """
+    Monte Carlo simulation of the closing balance over the next ``days`` days.
+
+    ``daily`` is a day-by-day series (see daily_series.build_daily_series).
+    Each path is stitched together from randomly chosen blocks of
+    ``block_days`` consecutive historical days of net flow (deposits minus
+    withdrawals), which keeps weekly rhythms and salary/rent clusters
+    intact, and is accumulated onto the current balance. All paths are
+    simulated at once as one (paths, days) array.
+
+    Returns a dict with:
+      bands: DataFrame of Date and P5..P95 balance percentiles per day,
+             plus Below_Threshold, the share of paths under ``threshold`` that day
+      probability_below: share of paths that drop under ``threshold`` at any point
+      threshold, paths, block_days: the settings used
+    """
+    if len(daily) == 0:
+        raise ValueError("No transactions to simulate from")
+    if days < 1:
+        raise ValueError("days must be at least 1")
+
+    net_flow = (daily["Deposit Amount"] - daily["Withdrawal Amount"]).to_numpy(dtype=float)
+    start_balance = float(daily["Closing Balance"].iloc[-1])
+
+    rng = np.random.default_rng(seed)
+    block_days = max(1, min(block_days, len(net_flow)))
+    block_count = -(-days // block_days)  # ceil
+    starts = rng.integers(0, len(net_flow) - block_days + 1, size=(paths, block_count))
+    day_index = (starts[:, :, np.newaxis] + np.arange(block_days)).reshape(paths, -1)[:, :days]
+    balances = start_balance + np.cumsum(net_flow[day_index], axis=1)
+    below = balances < threshold
+
+    bands = pd.DataFrame(
+        np.percentile(balances, BAND_PERCENTILES, axis=0).T,
+        columns=[f"P{percentile}" for percentile in BAND_PERCENTILES]
+    )
+    bands.insert(0, "Date", pd.date_range(daily["Date"].iloc[-1], periods=days + 1)[1:])
+    bands["Below_Threshold"] = below.mean(axis=0)
+
+    return {
+        'bands': bands,
+        'probability_below': float(below.any(axis=1).mean()),
+        'threshold': float(threshold),
+        'paths': int(paths),
+        'block_days': int(block_days)
+    }
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Speed/accuracy comparison of SPENDIFY's forecasting backends.
+
+Holds out the last part of each balance series, fits every backend on the
+rest, forecasts the holdout and reports fit+forecast time with the same
+MSME/RMAE metrics trans_pred() prints. The NumPy backend (Holt, AR) always
+runs; ARIMA and LSTM run when statsmodels / TensorFlow are installed.
+Models are trained from scratch (the forecast model cache is bypassed).
+For scores over many forecast origins rather than one split, see backtest.py.
+
+Usage: python benchmarks/forecast_accuracy.py [--holdout 0.2] [--password PW] [statement.pdf ...]
+       (without statements, a synthetic salary/spending series is used)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import FORECASTERS, forecaster_available, statement_series, synthetic_series
+from main import forecast_metrics
+
+def compare(name, balances, holdout):
+    split = int(len(balances) * (1 - holdout))
+    train, test = balances[:split], balances[split:]
+    print(f"\n{name}: {len(train)} training points, {len(test)} held out")
+    print(f"{'model':<8}{'backend':<9}{'seconds':>10}{'MSME':>12}{'RMAE':>12}")
+    for model_name, (backend, forecast, module) in FORECASTERS.items():
+        if not forecaster_available(model_name):
+            print(f"{model_name:<8}{backend:<9}{'skipped (' + module + ' not installed)':>34}")
+            continue
+        start = time.perf_counter()
+        predicted = forecast(train, len(test))
+        elapsed = time.perf_counter() - start
+        scores = forecast_metrics(test, predicted)
+        print(f"{model_name:<8}{backend:<9}{elapsed:10.3f}{scores['msme']:12.5f}{scores['rmae']:12.5f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('statements', nargs='*')
+    parser.add_argument('--holdout', type=float, default=0.2, help='fraction of the series held out for scoring')
+    parser.add_argument('--password', help='password for encrypted statements')
+    args = parser.parse_args()
+
+    if not args.statements:
+        compare('synthetic', synthetic_series()["Closing Balance"].to_numpy(), args.holdout)
+    for pdf_path in args.statements:
+        daily = statement_series(pdf_path, args.password)
+        compare(os.path.basename(pdf_path), daily["Closing Balance"].to_numpy(dtype=float), args.holdout)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for SPENDIFY's entry modules.
+
+Imports each module in a fresh interpreter several times, reports the median
+wall time, and exits non-zero if a module is over budget or pulls in one of
+the heavy forecasting/NLP libraries at import time.
+
+Usage: python benchmarks/import_time.py [--runs 5] [--budget 3.0] [module ...]  (default: main app)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be loaded when a forecast or NLP step actually runs.
+# (seaborn touches the bare statsmodels package, which is cheap; the models are not.)
+LAZY_MODULES = ['tensorflow', 'keras', 'statsmodels.tsa', 'sklearn', 'nltk']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+def measure(module, runs):
+    """Return (median seconds, eagerly loaded heavy modules) for importing ``module``"""
+    timings = []
+    eager = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(report['seconds'])
+        loaded = set(report['modules'])
+        eager.update(name for name in LAZY_MODULES if name in loaded)
+    return statistics.median(timings), sorted(eager)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=['main', 'app'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=float(os.environ.get('SPENDIFY_IMPORT_BUDGET', '3.0')),
+                        help='maximum median import time in seconds')
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        seconds, eager = measure(module, args.runs)
+        status = 'ok'
+        if seconds > args.budget:
+            status = f'over budget ({args.budget:.2f}s)'
+            failed = True
+        if eager:
+            status = f"eagerly imports {', '.join(eager)}"
+            failed = True
+        print(f"{module:<20} {seconds:6.3f}s  {status}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Scenario grid; the UI sliders step through these values
+SAVINGS_RATIOS = np.round(np.arange(0.0, 0.501, 0.05), 2)
+ESSENTIAL_SPLITS = np.round(np.arange(0.5, 0.901, 0.05), 2)
+CATEGORY_CAP_FACTORS = np.round(np.arange(0.5, 1.501, 0.1), 2)  # Cap as a multiple of past category spend
+DEFAULT_CATEGORY_CAP = 1.0  # Per-category cap weight for categories not in category_caps
+
+def budget_scenarios(predicted_income, predicted_expense, category_expense,
+                     savings_ratios=SAVINGS_RATIOS, essential_splits=ESSENTIAL_SPLITS,
+                     cap_factors=CATEGORY_CAP_FACTORS, category_caps=None):
+    """
+    Evaluate every budget scenario on the grid in one broadcast computation.
+
+    Axes are savings ratio (S), essential split (E), category cap factor (C)
+    and category (K). Categories get the adaptive allocation budget_system()
+    uses (predicted expense split by past spending share), capped at
+    ``cap factor x category cap x past spend``. ``category_caps`` maps a
+    category to its own cap weight (e.g. 0.8 to hold dining tighter than
+    rent), broadcast over the K axis; unlisted categories get
+    DEFAULT_CATEGORY_CAP, so by default every category is capped alike.
+    Returns plain lists, ready for JSON:
+      savings (S), essential_expense / non_essential_expense (E),
+      category_budget (C x K), over_cap (C x K, allocation cut by the cap),
+      planned_expense (C), surplus (S x C: income - savings - planned spend)
+    plus the grid axes, category names and their cap weights.
+    """
+    categories = list(category_expense.index)
+    past_spend = category_expense.to_numpy(dtype=float)
+    total_past = past_spend.sum()
+    share = past_spend / total_past if total_past else np.zeros_like(past_spend)
+
+    savings_ratios = np.asarray(savings_ratios, dtype=float)
+    essential_splits = np.asarray(essential_splits, dtype=float)
+    cap_factors = np.asarray(cap_factors, dtype=float)
+    category_caps = category_caps or {}
+    category_factors = np.array([category_caps.get(category, DEFAULT_CATEGORY_CAP)
+                                 for category in categories], dtype=float)   # (K,)
+
+    savings = predicted_income * savings_ratios                                # (S,)
+    essential_expense = predicted_expense * essential_splits                   # (E,)
+    non_essential_expense = predicted_expense - essential_expense              # (E,)
+
+    allocation = predicted_expense * share                                     # (K,)
+    caps = cap_factors[:, np.newaxis] * (category_factors * past_spend)[np.newaxis, :]  # (C, K)
+    category_budget = np.minimum(allocation[np.newaxis, :], caps)              # (C, K)
+    over_cap = allocation[np.newaxis, :] - category_budget                     # (C, K)
+    planned_expense = category_budget.sum(axis=1)                              # (C,)
+    surplus = predicted_income - savings[:, np.newaxis] - planned_expense[np.newaxis, :]  # (S, C)
+
+    return {
+        'savings_ratios': savings_ratios.tolist(),
+        'essential_splits': essential_splits.tolist(),
+        'cap_factors': cap_factors.tolist(),
+        'categories': categories,
+        'category_caps': category_factors.tolist(),
+        'savings': savings.tolist(),
+        'essential_expense': essential_expense.tolist(),
+        'non_essential_expense': non_essential_expense.tolist(),
+        'category_budget': category_budget.tolist(),
+        'over_cap': over_cap.tolist(),
+        'planned_expense': planned_expense.tolist(),
+        'surplus': surplus.tolist()
+    }
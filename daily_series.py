@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from analysis_cache import hash_frame
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('SPENDIFY_DAILY_CACHE_MAX_ENTRIES', '32'))
+
+SERIES_COLUMNS = ["Date", "Withdrawal Amount", "Deposit Amount", "Closing Balance"]
+
+def build_daily_series(df):
+    """
+    Turn a typed transaction frame into one row per calendar day.
+
+    Covers every day from the first to the last transaction with the daily
+    Withdrawal Amount and Deposit Amount sums, the end-of-day Closing Balance
+    and the number of Transactions. Days without transactions get zero flows
+    and carry the previous balance forward.
+    """
+    ordered = df[SERIES_COLUMNS].sort_values("Date", kind="stable")
+    ordered = ordered[ordered["Date"].notna()]
+    if ordered.empty:
+        # Typed, so .dt and the sums still work on a range without transactions
+        return pd.DataFrame({
+            "Date": pd.Series(dtype="datetime64[ns]"),
+            "Withdrawal Amount": pd.Series(dtype=float),
+            "Deposit Amount": pd.Series(dtype=float),
+            "Closing Balance": pd.Series(dtype=float),
+            "Transactions": pd.Series(dtype=int)
+        })
+
+    days = ordered["Date"].dt.normalize()
+    daily = ordered.groupby(days, sort=True).agg(**{
+        "Withdrawal Amount": ("Withdrawal Amount", "sum"),
+        "Deposit Amount": ("Deposit Amount", "sum"),
+        "Closing Balance": ("Closing Balance", "last"),  # Last non-missing balance of the day
+        "Transactions": ("Date", "size")
+    })
+
+    daily = daily.reindex(pd.date_range(daily.index[0], daily.index[-1], freq="D"))
+    flows = ["Withdrawal Amount", "Deposit Amount", "Transactions"]
+    daily[flows] = daily[flows].fillna(0)
+    daily["Transactions"] = daily["Transactions"].astype(int)
+    # Balances carry over quiet days; leading gaps take the first known balance
+    daily["Closing Balance"] = daily["Closing Balance"].ffill().bfill().fillna(0)
+
+    daily.index.name = "Date"
+    return daily.reset_index()
+
+class DailySeriesCache:
+    """
+    Thread-safe LRU cache of daily series, keyed by the content hash of the
+    transaction columns they are built from.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df):
+        """Return a copy of the daily series for ``df``, building it on a miss"""
+        key = hash_frame(df[SERIES_COLUMNS])
+        with self._lock:
+            daily = self._entries.get(key)
+            if daily is not None:
+                self._entries.move_to_end(key)
+        if daily is None:
+            daily = build_daily_series(df)
+            with self._lock:
+                self._entries[key] = daily
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        # Callers add columns to the series, so never hand out the cached object
+        return daily.copy()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_daily_series_cache = DailySeriesCache()
+
+def daily_series(df):
+    """Return the (cached) daily series of a typed transaction frame"""
+    return _daily_series_cache.get(df)
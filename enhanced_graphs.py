@@ -1,7 +1,15 @@
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import matplotlib
+matplotlib.use('Agg')  # Render off-screen; charts are served as images
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import pandas as pd
+from daily_series import daily_series
 
 # Enhanced styling configuration
 def setup_enhanced_style():
@@ -39,18 +47,8 @@ def format_currency(amount):
     else:
         return f"₹{amount:.0f}"
 
-def create_enhanced_graphs(analyzer):
-    """Create all enhanced graphs for the analyzer"""
-    setup_enhanced_style()
-    
-    df = analyzer.df
-    df_summary = df.groupby("Date").agg({
-        "Withdrawal Amount": "sum", 
-        "Deposit Amount": "sum", 
-        "Closing Balance": "last"
-    }).reset_index()
-    
-    # Graph 1: Daily Withdrawals vs Deposits (Enhanced)
+def _draw_graph1(df, df_summary):
+    """Graph 1: Daily Withdrawals vs Deposits (Enhanced)"""
     plt.figure(figsize=(12, 6))
     plt.plot(df_summary["Date"], df_summary["Withdrawal Amount"], 
              marker="o", linewidth=3, markersize=6, label="Withdrawals", 
@@ -70,10 +68,9 @@ def create_enhanced_graphs(analyzer):
     plt.legend(frameon=True, shadow=True)
     plt.xticks(rotation=45, fontsize=8)
     plt.subplots_adjust(bottom=0.35)
-    plt.savefig("static/graph1.png", dpi=300, bbox_inches='tight', pad_inches=0.5)
-    plt.close()
 
-    # Graph 2: Total Withdrawals vs Deposits (Enhanced Pie)
+def _draw_graph2(df, df_summary):
+    """Graph 2: Total Withdrawals vs Deposits (Enhanced Pie)"""
     plt.figure(figsize=(12, 6))
     total_withdrawal = df_summary["Withdrawal Amount"].sum()
     total_deposit = df_summary["Deposit Amount"].sum()
@@ -92,10 +89,9 @@ def create_enhanced_graphs(analyzer):
     
     plt.title("Total Withdrawals vs Deposits", fontweight='bold', pad=20)
     plt.axis('equal')
-    plt.savefig("static/graph2.png", dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # Graph 3: Closing Balance Over Time (Enhanced)
+def _draw_graph3(df, df_summary):
+    """Graph 3: Closing Balance Over Time (Enhanced)"""
     plt.figure(figsize=(12, 6))
     plt.plot(df_summary["Date"], df_summary["Closing Balance"], 
              marker="o", linewidth=3, markersize=6, color="#3498db", alpha=0.8)
@@ -115,10 +111,9 @@ def create_enhanced_graphs(analyzer):
     plt.legend()
     plt.xticks(rotation=45, fontsize=8)
     plt.subplots_adjust(bottom=0.35)
-    plt.savefig("static/graph3.png", dpi=300, bbox_inches='tight', pad_inches=0.5)
-    plt.close()
 
-    # Graph 4: Transaction Amount Distribution (Enhanced)
+def _draw_graph4(df, df_summary):
+    """Graph 4: Transaction Amount Distribution (Enhanced)"""
     plt.figure(figsize=(12, 6))
     
     # Filter out zero values for better visualization
@@ -135,10 +130,9 @@ def create_enhanced_graphs(analyzer):
     plt.title("Distribution of Transaction Amounts", fontweight='bold', pad=20)
     plt.legend()
     plt.tight_layout()
-    plt.savefig("static/graph4.png", dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # Graph 5: Most Frequent Transactions (Enhanced)
+def _draw_graph5(df, df_summary):
+    """Graph 5: Most Frequent Transactions (Enhanced)"""
     top_narrations = df["Narration"].value_counts().nlargest(10).sort_values()
     
     plt.figure(figsize=(6, 2))
@@ -159,10 +153,9 @@ def create_enhanced_graphs(analyzer):
     plt.ylabel("Transaction Type", fontweight='bold', fontsize=6)
     plt.title("Most Frequent Transactions (Top 10)", fontweight='bold', pad=10, fontsize=6)
     plt.subplots_adjust(left=0.6, right=0.95, top=0.92, bottom=0.08)
-    plt.savefig("static/graph5.png", dpi=300, bbox_inches='tight', pad_inches=0.5)
-    plt.close()
 
-    # Graph 6: Top Withdrawal Amounts (Enhanced)
+def _draw_graph6(df, df_summary):
+    """Graph 6: Top Withdrawal Amounts (Enhanced)"""
     narration_amounts = df.groupby("Narration")["Withdrawal Amount"].sum()
     top_narrations = narration_amounts.nlargest(10).sort_values()
     
@@ -184,10 +177,9 @@ def create_enhanced_graphs(analyzer):
     plt.ylabel("Transaction Type", fontweight='bold', fontsize=6)
     plt.title("Top 10 Transactions by Total Withdrawal Amount", fontweight='bold', pad=10, fontsize=6)
     plt.subplots_adjust(left=0.6, right=0.95, top=0.92, bottom=0.08)
-    plt.savefig("static/graph6.png", dpi=300, bbox_inches='tight', pad_inches=0.5)
-    plt.close()
 
-    # Graph 7: Daily Deposits and Withdrawals (Enhanced Waterfall)
+def _draw_graph7(df, df_summary):
+    """Graph 7: Daily Deposits and Withdrawals (Enhanced Waterfall)"""
     plt.figure(figsize=(16, 10))
     
     # Create the bar chart
@@ -219,10 +211,9 @@ def create_enhanced_graphs(analyzer):
     plt.legend(frameon=True, shadow=True)
     plt.xticks(rotation=45, fontsize=8)
     plt.subplots_adjust(bottom=0.4)
-    plt.savefig("static/graph7.png", dpi=300, bbox_inches='tight', pad_inches=0.5)
-    plt.close()
 
-    # Graph 8: Financial Summary (Enhanced)
+def _draw_graph8(df, df_summary):
+    """Graph 8: Financial Summary (Enhanced)"""
     summary = df[["Withdrawal Amount", "Deposit Amount", "Closing Balance"]].describe()
     
     categories = ["Withdrawals", "Deposits", "Closing Balance"]
@@ -267,38 +258,31 @@ def create_enhanced_graphs(analyzer):
     ax.legend(frameon=True, shadow=True, fontsize=11)
     
     plt.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
-    plt.savefig("static/graph8.png", dpi=300, bbox_inches='tight', pad_inches=0.2)
-    plt.close()
 
-    # Graph 9: Transaction Category Distribution (Enhanced)
-    if 'Category' in df.columns:
-        category_counts = df['Category'].value_counts()
-        
-        plt.figure(figsize=(12, 6))
-        colors = sns.color_palette("Set3", len(category_counts))
-        
-        wedges, texts, autotexts = plt.pie(
-            category_counts.values,
-            labels=category_counts.index,
-            autopct=lambda pct: f'{pct:.1f}%' if pct > 3 else '',
-            colors=colors,
-            startangle=90,
-            explode=[0.05 if i == 0 else 0 for i in range(len(category_counts))],
-            shadow=True,
-            textprops={'fontsize': 11, 'fontweight': 'bold'}
-        )
-        
-        plt.title("Transaction Category Distribution", fontweight='bold', pad=20)
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig("static/graph9.png", dpi=300, bbox_inches='tight')
-        plt.close()
-
-def create_budget_graphs(category_expense, dynamic_savings, essential_expense, non_essential_expense):
-    """Create enhanced budget-related graphs"""
-    setup_enhanced_style()
-    
-    # Graph 10: Expense Breakdown by Category (Enhanced)
+def _draw_graph9(df, df_summary):
+    """Graph 9: Transaction Category Distribution (Enhanced)"""
+    category_counts = df['Category'].value_counts()
+
+    plt.figure(figsize=(12, 6))
+    colors = sns.color_palette("Set3", len(category_counts))
+
+    wedges, texts, autotexts = plt.pie(
+        category_counts.values,
+        labels=category_counts.index,
+        autopct=lambda pct: f'{pct:.1f}%' if pct > 3 else '',
+        colors=colors,
+        startangle=90,
+        explode=[0.05 if i == 0 else 0 for i in range(len(category_counts))],
+        shadow=True,
+        textprops={'fontsize': 11, 'fontweight': 'bold'}
+    )
+
+    plt.title("Transaction Category Distribution", fontweight='bold', pad=20)
+    plt.axis('equal')
+    plt.tight_layout()
+
+def _draw_graph10(category_expense):
+    """Graph 10: Expense Breakdown by Category (Enhanced)"""
     category_expense_sorted = category_expense.sort_values(ascending=False)
     
     plt.figure(figsize=(12, 6))
@@ -317,10 +301,9 @@ def create_budget_graphs(category_expense, dynamic_savings, essential_expense, n
     plt.ylabel("Amount (₹)", fontweight='bold', fontsize=12)
     plt.title("Expense Breakdown by Category", fontweight='bold', pad=20, fontsize=14)
     plt.subplots_adjust(left=0.08, right=0.95, top=0.9, bottom=0.45)
-    plt.savefig("static/graph10.png", dpi=300, bbox_inches='tight', pad_inches=0.2)
-    plt.close()
-    
-    # Graph 11: Budget Allocation (Enhanced)
+
+def _draw_graph11(dynamic_savings, essential_expense, non_essential_expense):
+    """Graph 11: Budget Allocation (Enhanced)"""
     plt.figure(figsize=(12, 6))
     sizes = [dynamic_savings, essential_expense, non_essential_expense]
     labels = ["Savings", "Essentials", "Non-Essentials"]
@@ -337,5 +320,143 @@ def create_budget_graphs(category_expense, dynamic_savings, essential_expense, n
     plt.title("Recommended Budget Allocation", fontweight='bold', pad=20)
     plt.axis('equal')
     plt.tight_layout()
-    plt.savefig("static/graph11.png", dpi=300, bbox_inches='tight')
-    plt.close()
\ No newline at end of file
+
+# Renderers by graph id. Statement charts (1-9) take (df, df_summary), where
+# df_summary is the day-by-day series from daily_series();
+# budget charts (10-11) take the budget figures they plot.
+GRAPH_RENDERERS = {
+    1: _draw_graph1,
+    2: _draw_graph2,
+    3: _draw_graph3,
+    4: _draw_graph4,
+    5: _draw_graph5,
+    6: _draw_graph6,
+    7: _draw_graph7,
+    8: _draw_graph8,
+    9: _draw_graph9,
+    10: _draw_graph10,
+    11: _draw_graph11,
+}
+STATEMENT_GRAPHS = list(range(1, 10))
+BUDGET_GRAPHS = [10, 11]
+
+# savefig() options each chart has always been written with
+GRAPH_SAVE_OPTIONS = {
+    1: dict(bbox_inches='tight', pad_inches=0.5),
+    2: dict(bbox_inches='tight'),
+    3: dict(bbox_inches='tight', pad_inches=0.5),
+    4: dict(bbox_inches='tight'),
+    5: dict(bbox_inches='tight', pad_inches=0.5),
+    6: dict(bbox_inches='tight', pad_inches=0.5),
+    7: dict(bbox_inches='tight', pad_inches=0.5),
+    8: dict(bbox_inches='tight', pad_inches=0.2),
+    9: dict(bbox_inches='tight'),
+    10: dict(bbox_inches='tight', pad_inches=0.2),
+    11: dict(bbox_inches='tight'),
+}
+
+# Output resolutions accepted by render_graph(), in dpi
+GRAPH_SIZES = {
+    'small': 100,
+    'medium': 150,
+    'full': 300
+}
+DEFAULT_GRAPH_SIZE = 'full'
+
+# Bulk rendering fans charts out to a process pool; set SPENDIFY_RENDER_WORKERS=1 to render serially
+RENDER_WORKERS = int(os.environ.get('SPENDIFY_RENDER_WORKERS', str(os.cpu_count() or 1)))
+
+# pyplot keeps global figure state, so renders from concurrent request threads must not interleave
+_RENDER_LOCK = threading.Lock()
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def available_graphs(df):
+    """Return the statement graph ids that can be drawn for this DataFrame"""
+    graph_ids = [graph_id for graph_id in STATEMENT_GRAPHS if graph_id != 9]
+    if 'Category' in df.columns:
+        graph_ids.append(9)
+    return graph_ids
+
+def _render_png(graph_id, args, size=DEFAULT_GRAPH_SIZE):
+    """Draw one chart with the given renderer arguments and return the PNG bytes"""
+    if size not in GRAPH_SIZES:
+        raise ValueError(f"Unsupported graph size: {size}")
+
+    buffer = io.BytesIO()
+    with _RENDER_LOCK:
+        setup_enhanced_style()
+        try:
+            GRAPH_RENDERERS[graph_id](*args)
+            plt.savefig(buffer, format='png', dpi=GRAPH_SIZES[size], **GRAPH_SAVE_OPTIONS[graph_id])
+        finally:
+            plt.close('all')
+    return buffer.getvalue()
+
+def render_graph(df, graph_id, size=DEFAULT_GRAPH_SIZE, df_summary=None):
+    """Render a single statement chart and return the PNG bytes"""
+    if graph_id not in available_graphs(df):
+        raise KeyError(f"Graph {graph_id} is not available for this statement")
+    if df_summary is None:
+        df_summary = daily_series(df)
+    return _render_png(graph_id, (df, df_summary), size)
+
+def _reset_worker_lock():
+    # A forked worker may inherit the lock while another thread holds it
+    global _RENDER_LOCK
+    _RENDER_LOCK = threading.Lock()
+
+def _get_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, initializer=_reset_worker_lock)
+        return _render_pool
+
+def render_graphs(tasks, size=DEFAULT_GRAPH_SIZE, parallel=None):
+    """
+    Render several charts and return {graph_id: png_bytes}.
+
+    ``tasks`` maps graph ids to their renderer arguments. With ``parallel``
+    (the default when more than one render worker is configured) the charts
+    are drawn concurrently in a process pool, since matplotlib rendering is
+    CPU-bound and holds the GIL; otherwise they are drawn one after another.
+    """
+    if parallel is None:
+        parallel = RENDER_WORKERS > 1
+    if parallel and len(tasks) > 1:
+        global _render_pool
+        try:
+            pool = _get_render_pool()
+            futures = {graph_id: pool.submit(_render_png, graph_id, args, size) for graph_id, args in tasks.items()}
+            return {graph_id: future.result() for graph_id, future in futures.items()}
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); drop the pool and fall back to rendering in-process
+            print("Render pool failed, rendering charts serially")
+            with _render_pool_lock:
+                _render_pool = None
+    return {graph_id: _render_png(graph_id, args, size) for graph_id, args in tasks.items()}
+
+def create_enhanced_graphs(analyzer, parallel=None):
+    """
+    Create all enhanced graphs for the analyzer.
+
+    Images are kept in memory on ``analyzer.charts`` ({graph_id: png_bytes})
+    rather than written to shared files, so concurrent statements never
+    overwrite each other's charts.
+    """
+    df = analyzer.df
+    df_summary = daily_series(df)
+
+    tasks = {graph_id: (df, df_summary) for graph_id in available_graphs(df)}
+    images = render_graphs(tasks, parallel=parallel)
+    analyzer.charts.update(images)
+    return images
+
+def create_budget_graphs(category_expense, dynamic_savings, essential_expense, non_essential_expense, parallel=None):
+    """Create enhanced budget-related graphs and return {graph_id: png_bytes}"""
+    tasks = {
+        10: (category_expense,),
+        11: (dynamic_savings, essential_expense, non_essential_expense)
+    }
+    return render_graphs(tasks, parallel=parallel)
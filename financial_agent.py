@@ -5,6 +5,8 @@ from langgraph.graph import StateGraph, END
 import pandas as pd
 import os
 
+from statement_summary import summarize
+
 class FinancialState(TypedDict):
     question: str
     financial_data: dict
@@ -75,8 +77,11 @@ def is_finance_related(question: str) -> bool:
     # The LLM will handle filtering non-financial topics
     return True
 
-def get_financial_advice(question: str, df: pd.DataFrame):
+def get_financial_advice(question: str, df: pd.DataFrame = None, summary: dict = None):
+    # Pass the cached statement summary when there is one; otherwise it is computed from df
     try:
+        if summary is None:
+            summary = summarize(df)
        
         # Let the LLM handle all questions now
         # if not is_finance_related(question):
@@ -84,11 +89,11 @@ def get_financial_advice(question: str, df: pd.DataFrame):
         
         
         financial_data = {
-            "current_balance": float(df['Closing Balance'].iloc[-1]),
-            "total_deposits": float(df['Deposit Amount'].sum()),
-            "total_withdrawals": float(df['Withdrawal Amount'].sum()),
-            "transaction_count": len(df),
-            "top_categories": df['Category'].value_counts().head(3).index.tolist()
+            "current_balance": summary['current_balance'],
+            "total_deposits": summary['total_deposits'],
+            "total_withdrawals": summary['total_withdrawals'],
+            "transaction_count": summary['transaction_count'],
+            "top_categories": list(summary['category_counts'])[:3]
         }
         
         
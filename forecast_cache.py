@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_CACHE_DIR = os.environ.get('SPENDIFY_FORECAST_CACHE_DIR', 'forecast_models')
+DEFAULT_MAX_ENTRIES = int(os.environ.get('SPENDIFY_FORECAST_CACHE_ENTRIES', '16'))
+DEFAULT_MAX_DISK_BYTES = int(os.environ.get('SPENDIFY_FORECAST_CACHE_BYTES', str(256 * 1024 * 1024)))
+
+# Payload fields that only live in memory (live Keras models and compiled functions do not pickle cleanly)
+TRANSIENT_FIELDS = ('lstm_model', 'lstm_rollout')
+
+def forecast_cache_key(balances, seq_length, config):
+    """Return the cache key for models trained on ``balances`` with ``seq_length`` and ``config``"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(balances, dtype=np.float64).tobytes())
+    digest.update(json.dumps({'seq_length': seq_length, 'config': config}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+class ForecastModelCache:
+    """
+    Two-level cache of trained forecast models.
+
+    A payload is a dict holding either the fitted LSTM weights, scaler and
+    ARIMA results for one balance series, or a stored max-horizon forecast
+    of that series (see AccountManagementAnalyzer.trans_pred). The most
+    recently used ``max_entries`` payloads stay in memory; every payload is
+    also pickled under ``cache_dir`` so models survive restarts, and the
+    oldest files are removed once the directory grows past ``max_disk_bytes``.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _remember(self, key, payload):
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return the payload for ``key`` from memory or disk, or None on a miss"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+
+        path = self._path(key) if self.cache_dir else None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+            os.utime(path)  # Keeps the disk eviction order least-recently-used
+        except (TypeError, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember(key, payload)
+            self.hits += 1
+        return payload
+
+    def put(self, key, payload):
+        """Store ``payload`` under ``key`` in memory and on disk"""
+        with self._lock:
+            self._remember(key, payload)
+        if not self.cache_dir:
+            return
+
+        stored = {name: value for name, value in payload.items() if name not in TRANSIENT_FIELDS}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        # Write-then-rename so a concurrent reader never unpickles a half-written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        # Oldest first, but never the file just written
+        for _, size, path in sorted(files)[:-1]:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_JOB_WORKERS = int(os.environ.get('SPENDIFY_FORECAST_WORKERS', '2'))
+DEFAULT_JOB_TTL = int(os.environ.get('SPENDIFY_FORECAST_JOB_TTL', '3600'))
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+class InMemoryJobStore:
+    """
+    Thread-safe in-process store of job records.
+
+    A record is a dict with id, owner, status, progress (0-1), message,
+    result, error and timestamps. Finished jobs are dropped ``ttl_seconds``
+    after they finish.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_JOB_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, owner=None):
+        now = time.monotonic()
+        job = {
+            'id': uuid.uuid4().hex,
+            'owner': owner,
+            'status': 'queued',
+            'progress': 0.0,
+            'message': 'Waiting for a worker',
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'finished_at': None
+        }
+        with self._lock:
+            self._purge(now)
+            self._jobs[job['id']] = job
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def get(self, job_id):
+        """Return a snapshot of the job record, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _purge(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and now - job['finished_at'] > self.ttl_seconds]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def __len__(self):
+        return len(self._jobs)
+
+class JobQueue:
+    """
+    Runs forecast jobs off the request thread and tracks their progress.
+
+    ``executor`` is anything with the concurrent.futures ``submit(fn, *args)``
+    interface and ``store`` anything with the InMemoryJobStore methods. By
+    default both are local (a thread pool and an in-process store), but a
+    broker client and a shared store can be dropped in without touching the
+    routes. Job functions are called as ``fn(report, *args)``, where
+    ``report(progress, message)`` publishes progress to the store.
+    """
+
+    def __init__(self, executor=None, store=None, max_workers=DEFAULT_JOB_WORKERS):
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast')
+        self.store = store or InMemoryJobStore()
+
+    def submit(self, fn, *args, owner=None):
+        """Queue ``fn`` and return the new job's id"""
+        job = self.store.create(owner)
+        self.executor.submit(self._run, job['id'], fn, *args)
+        return job['id']
+
+    def _run(self, job_id, fn, *args):
+        def report(progress, message):
+            self.store.update(job_id, progress=progress, message=message)
+
+        self.store.update(job_id, status='running', message='Started')
+        try:
+            result = fn(report, *args)
+        except Exception as e:
+            print(f"Forecast job {job_id} failed: {e}")
+            self.store.update(job_id, status='failed', error=str(e), message='Failed',
+                              finished_at=time.monotonic())
+        else:
+            self.store.update(job_id, status='done', progress=1.0, result=result, message='Done',
+                              finished_at=time.monotonic())
+
+    def get(self, job_id, owner=None):
+        """Return the job record, or None if it is unknown or belongs to someone else"""
+        job = self.store.get(job_id)
+        if job is None or job['owner'] != owner:
+            return None
+        return job
@@ -18,35 +18,21 @@ os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend to avoid GUI threading issues
-from matplotlib import pyplot as plt
-from pypdf import PdfReader, PdfWriter
+from pypdf import PdfReader
 import pdfplumber
 import csv
 import re
 import os
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
-from statsmodels.tsa.arima.model import ARIMA
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from concurrent.futures import ProcessPoolExecutor
+# TensorFlow, statsmodels and scikit-learn are imported inside trans_pred():
+# they take tens of seconds to load and only the forecasting path needs them.
+# Charts import matplotlib through enhanced_graphs when they are drawn.
 
 # Suppress TensorFlow warnings
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='tensorflow')
 warnings.filterwarnings('ignore', category=FutureWarning, module='tensorflow')
 
-# Ensure NLTK downloads are available
-nltk_data_path = os.path.expanduser('~/AppData/Roaming/nltk_data')
-
-if not os.path.exists(nltk_data_path):
-    nltk.download('punkt')
-    nltk.download('stopwords')
-
 # Bank Configuration System
 BANK_CONFIGS = {
     'HDFC': {
@@ -98,6 +84,188 @@ BANK_CONFIGS = {
 
 }
 
+# Transaction categories in priority order: a narration gets the first category
+# with a keyword contained in its lowercased text. Keywords are matched as
+# written, so mixed-case entries such as "Paytm" never match.
+TRANSACTION_CATEGORIES = {
+    "Food/Clothing": [
+        "zomato", "swiggy", "flipkart", "groceries", "amazon", "myntra", "ajio","grofers",
+        "nike", "adidas", "zepto", "bigbasket", "dmart", "reliance fresh", "spencers", "foodpanda",
+        "kfc", "mcdonalds", "dominos", "pizzahut", "subway", "burger king", "fbb", "pantaloons", "westside","Departmnt Store"
+    ],
+    "Entertainment": [
+        "netflix", "prime", "hotstar", "spotify", "google", "book my show", "jiocinema",
+        "hulu", "disney", "sony liv", "voot", "zee5", "itunes", "youtube premium", "audible", "gaana", "wynk"
+    ],
+    "Recharge": [
+        "airtel", "jio", "vodafone", "bsnl", "recharge", "top-up", "vi", "talktime", "prepaid", "postpaid",
+        "mobile recharge", "phonepe recharge", "paytm recharge","mobikwik recharge","Paytm"
+    ],
+    "Rent/Bills": [
+        "electricity", "water bill", "rent", "utility", "phonepe", "bbpsbp", "landlord",
+        "property tax", "maintenance", "gas bill", "internet bill", "dth recharge", "municipal tax"
+    ],
+    "Transport": [
+        "rapido", "ola", "uber", "metro", "rail", "bus", "flight", "taxi", "redbus", "irctc",
+        "indigo", "air india", "spicejet", "go air", "blablacar", "cab", "rickshaw", "fuel", "petrol", "diesel"
+    ],
+    "Emergency": [
+        "hospital", "doctor", "medical", "pharmacy", "cash deposit", "emergency", "ambulance",
+        "surgery", "clinic", "meds", "medlife", "pharmeasy", "apollo", "fortis", "max healthcare"
+    ],
+    "Banking": [
+        "airtel payments bank", "navi technologies", "banking", "loan", "credit card", "debit card",
+        "upi", "neft", "imps", "rtgs", "interest", "savings", "hdfc", "icici", "sbi", "axis bank", "kotak"
+    ],
+    "Gaming": [
+        "steam", "epic games", "pubg", "game", "valorant", "counter strike", "call of duty", "roblox",
+        "playstation", "xbox", "nintendo", "esports", "minecraft", "rummy", "poker", "fantasy cricket"
+    ],
+    "Trading": [
+        "zerodha", "upstox", "angel broking", "groww", "stocks", "equity", "mutual funds",
+        "investment", "bonds", "nse", "bse", "cryptocurrency", "bitcoin", "forex", "commodities", "shares"
+    ],
+    "Personal Transfer": []  # Fallback for narrations matching no keyword
+}
+
+_transaction_classifier = None
+
+def get_transaction_classifier():
+    """Return the keyword classifier for TRANSACTION_CATEGORIES, compiled on first use"""
+    global _transaction_classifier
+    if _transaction_classifier is None:
+        from transaction_classifier import KeywordClassifier
+        _transaction_classifier = KeywordClassifier(TRANSACTION_CATEGORIES)
+    return _transaction_classifier
+
+# Forecast model settings; trained models are cached per balance series and these values
+FORECAST_SEQ_LENGTH = 5  # Use past 5 days to predict next day
+FORECAST_CONFIG = {
+    'lstm_units': 50,
+    'epochs': 50,
+    'batch_size': 16,
+    'arima_order': (5, 1, 0)
+}
+
+_forecast_model_cache = None
+
+def get_forecast_model_cache():
+    """Return the shared cache of trained forecast models, created on first use"""
+    global _forecast_model_cache
+    if _forecast_model_cache is None:
+        from forecast_cache import ForecastModelCache
+        _forecast_model_cache = ForecastModelCache()
+    return _forecast_model_cache
+
+def make_lstm_rollout(model):
+    """
+    Compile an autoregressive rollout for a one-step LSTM.
+
+    The returned function takes a (1, seq_length, 1) window and a step count
+    and feeds each prediction back into the window inside a single
+    tf.function, so a whole horizon costs one call instead of one
+    model.predict per day. Steps are passed as a tensor, so the function is
+    traced once and reused for any horizon.
+    """
+    import tensorflow as tf
+
+    @tf.function(reduce_retracing=True)
+    def rollout(window, steps):
+        outputs = tf.TensorArray(tf.float32, size=steps)
+        for i in tf.range(steps):
+            next_value = model(window, training=False)
+            outputs = outputs.write(i, next_value[0, 0])
+            window = tf.concat([window[:, 1:, :], tf.reshape(next_value, (1, 1, 1))], axis=1)
+        return outputs.stack()
+
+    return rollout
+
+FORECAST_MODES = ('full', 'fast')
+# Full mode needs at least one training and one test window of FORECAST_SEQ_LENGTH days
+FULL_FORECAST_MIN_DAYS = FORECAST_SEQ_LENGTH + 2
+# Forecasts are computed once up to this many days and sliced for each request
+FORECAST_MAX_HORIZON = int(os.environ.get('SPENDIFY_FORECAST_MAX_HORIZON', '365'))
+FAST_FORECAST_AR_ORDER = 5
+# Smoothing/trend weights and trend damping factors searched by holt_forecast()
+HOLT_SMOOTHING_GRID = np.linspace(0.05, 0.95, 19)
+HOLT_DAMPING_GRID = np.array([0.8, 0.9, 0.95, 0.98, 1.0])
+
+def forecast_metrics(actual, predicted):
+    """
+    Return {'msme', 'rmae'} for a forecast: mean squared error over the mean
+    squared actual balance, and mean absolute error over the mean actual balance.
+    """
+    actual = np.asarray(actual, dtype=float).ravel()
+    predicted = np.asarray(predicted, dtype=float).ravel()
+    return {
+        'msme': float(np.mean((actual - predicted) ** 2) / np.mean(actual ** 2)),
+        'rmae': float(np.mean(np.abs(actual - predicted)) / np.mean(actual))
+    }
+
+def holt_forecast(values, steps):
+    """
+    Damped-trend Holt exponential smoothing using NumPy only.
+
+    Every (alpha, beta, phi) combination on the smoothing and damping grids
+    is filtered through the series at once as one vector, and the
+    combination with the lowest one-step-ahead squared error forecasts
+    ``steps`` values ahead.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 3:
+        return np.full(steps, values[-1] if len(values) else 0.0)
+
+    alpha, beta, phi = (grid.ravel() for grid in np.meshgrid(
+        HOLT_SMOOTHING_GRID, HOLT_SMOOTHING_GRID, HOLT_DAMPING_GRID, indexing='ij'))
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0])
+    sse = np.zeros(alpha.shape)
+    for value in values[1:]:
+        one_step = level + phi * trend
+        sse += (value - one_step) ** 2
+        new_level = alpha * value + (1 - alpha) * one_step
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        level = new_level
+
+    best = np.argmin(sse)
+    damping = np.cumsum(phi[best] ** np.arange(1, steps + 1))
+    return level[best] + damping * trend[best]
+
+def ar_forecast(values, steps, order=FAST_FORECAST_AR_ORDER):
+    """
+    NumPy counterpart of ARIMA(order, 1, 0): an AR(order) model of the daily
+    changes fitted by closed-form least squares, rolled forward and summed
+    back onto the last value.
+    """
+    values = np.asarray(values, dtype=float)
+    diffs = np.diff(values)
+    if len(diffs) <= order * 2:
+        return np.full(steps, values[-1] if len(values) else 0.0)
+
+    lags = np.lib.stride_tricks.sliding_window_view(diffs[:-1], order)
+    coefficients, *_ = np.linalg.lstsq(lags, diffs[order:], rcond=None)
+
+    window = list(diffs[-order:])
+    changes = np.empty(steps)
+    for step in range(steps):
+        changes[step] = np.dot(coefficients, window[-order:])
+        window.append(changes[step])
+    return values[-1] + np.cumsum(changes)
+
+def fast_forecast(balances, future_days):
+    """
+    Holt and AR forecasts of a balance series, returned as
+    (holt_values, ar_values, metrics) with metrics from an 80/20 holdout.
+    """
+    balances = np.asarray(balances, dtype=float)
+    split = int(len(balances) * 0.8)
+    train, test = balances[:split], balances[split:]
+    metrics = {}
+    if split and len(test):
+        metrics['Holt'] = forecast_metrics(test, holt_forecast(train, len(test)))
+        metrics['AR'] = forecast_metrics(test, ar_forecast(train, len(test)))
+    return holt_forecast(balances, future_days), ar_forecast(balances, future_days), metrics
+
 def detect_bank(df):
     """
     Automatically detect the bank based on column names in the dataframe
@@ -206,16 +374,124 @@ def standardize_columns(df, bank_code):
     
     return standardized_df
 
+# Page-parallel PDF table extraction: worker count and the page count below which
+# extraction stays serial. A page takes ~0.2s to extract, while starting the pool and
+# re-opening the PDF in every worker costs ~0.8s or more, so short statements lose
+PDF_EXTRACT_WORKERS = int(os.environ.get('SPENDIFY_PDF_WORKERS', str(os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('SPENDIFY_PDF_PARALLEL_MIN_PAGES', '32'))
+
+def _extract_tables(pages):
+    """Return the rows of every page's table, in page order"""
+    rows = []
+    for page in pages:
+        table = page.extract_table()
+        if table:
+            rows.extend(table)
+    return rows
+
+def _extract_page_range(pdf_path, start, stop, password=None):
+    """Process-pool task: extract the table rows of pages [start, stop)"""
+    with pdfplumber.open(pdf_path, password=password or "") as pdf:
+        return _extract_tables(pdf.pages[start:stop])
+
+def extract_statement_rows(pdf_path, workers=None, password=None, start_page=0):
+    """
+    Extract the table rows from every page of a statement PDF.
+
+    Large PDFs are split into contiguous page ranges that are extracted in a
+    process pool and concatenated back in page order, so the rows are exactly
+    those of a serial page-by-page pass. ``workers`` is capped at the CPU
+    count; PDFs shorter than PDF_PARALLEL_MIN_PAGES, or with a single worker
+    (always the case on one CPU), are extracted serially.
+    Encrypted PDFs are decrypted lazily as pages are read, given ``password``.
+    Pages before ``start_page`` are skipped.
+    """
+    if workers is None:
+        workers = PDF_EXTRACT_WORKERS
+    # More processes than CPUs only add start-up and contention
+    workers = min(workers, os.cpu_count() or 1)
+
+    with pdfplumber.open(pdf_path, password=password or "") as pdf:
+        page_count = len(pdf.pages) - start_page
+        if page_count <= 0:
+            return []
+        if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            return _extract_tables(pdf.pages[start_page:])
+
+    # Two ranges per worker smooths out pages that take longer than others
+    range_count = min(page_count, workers * 2)
+    bounds = [start_page + round(i * page_count / range_count) for i in range(range_count + 1)]
+    with ProcessPoolExecutor(max_workers=min(workers, range_count)) as pool:
+        chunks = pool.map(_extract_page_range, [pdf_path] * range_count, bounds[:-1], bounds[1:],
+                          [password] * range_count)
+        return [row for chunk in chunks for row in chunk]
+
+def extract_first_page_rows(pdf_path, password=None):
+    """Return the table rows of the first page only (empty if it has no table)"""
+    with pdfplumber.open(pdf_path, password=password or "") as pdf:
+        if not pdf.pages:
+            return []
+        return _extract_tables(pdf.pages[:1])
+
+def _frame_columns(header):
+    """Column names for a header row, named and de-duplicated the way pd.read_csv does"""
+    columns = []
+    seen = {}
+    for i, name in enumerate(header):
+        name = name if name not in (None, '') else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def rows_to_frame(rows):
+    """
+    Build the raw statement DataFrame from extracted table rows.
+
+    The first row is the header. Cells stay as text and empty cells become
+    NaN, matching what the old CSV round trip produced for everything the
+    pipeline reads (amounts, dates and narrations are parsed from text later).
+    """
+    if not rows:
+        raise ValueError("No tables found in the PDF")
+
+    columns = _frame_columns(rows[0])
+    width = len(columns)
+    # Pad short rows and trim long ones to the header width
+    data = [(list(row) + [None] * width)[:width] for row in rows[1:]]
+    df = pd.DataFrame(data, columns=columns, dtype=object)
+    return df.replace({'': np.nan, None: np.nan})
+
+def read_statement_csv(csv_path):
+    """Load rows exported by analyze(export_csv=True) into the same raw DataFrame"""
+    with open(csv_path, newline="") as f:
+        return rows_to_frame(list(csv.reader(f)))
+
 class AccountManagementAnalyzer:
     def __init__(self):
         self.df = None
+        self.raw_df = None  # Statement rows as extracted from the PDF
+        self.pdf_password = None  # Set by remove_pdf_password() for encrypted PDFs
+        self._preflight = None  # (pdf path, first-page rows) from preflight(), used once by analyze()
         self.csv_file = None
         self.prediction_df = None
+        self.daily_df = None  # Day-by-day balance series used by trans_pred()
+        self.simulation = None  # Monte Carlo balance bands from trans_pred()
         self.bank_code = None
         self.bank_config = None
+        self.charts = {}  # graph id -> PNG bytes for this statement
 
     def remove_pdf_password(self, input_pdf, password):
-        output_pdf = os.path.splitext(input_pdf)[0] + "_unprotected.pdf"
+        """
+        Check the password of an encrypted PDF and remember it for analyze().
+
+        The PDF is no longer rewritten to an ``_unprotected.pdf`` copy: the
+        extractor decrypts pages in memory as it reads them. Returns the path
+        to pass to analyze().
+        """
         try:
             reader = PdfReader(input_pdf)
             
@@ -224,14 +500,11 @@ class AccountManagementAnalyzer:
                 if not password:  # No password provided for encrypted PDF
                     raise ValueError("This PDF is password protected. Please enter the password.")
                 
-                if reader.decrypt(password) == 1:
-                    writer = PdfWriter()
-                    for page in reader.pages:
-                        writer.add_page(page)
-                    with open(output_pdf, "wb") as f:
-                        writer.write(f)
-                    print("Password removed successfully!")
-                    return output_pdf
+                # Either password type works (PasswordType.NOT_DECRYPTED is 0)
+                if reader.decrypt(password):
+                    self.pdf_password = password
+                    print("Password verified successfully!")
+                    return input_pdf
                 else:
                     raise ValueError("Incorrect password provided.")
             else:
@@ -245,21 +518,63 @@ class AccountManagementAnalyzer:
             print("An error occurred:", e)
             return None
 
-    def analyze(self, pdf_path):
+    def preflight(self, pdf_path, bank_code=None):
+        """
+        Check the statement header on the first page before extracting everything.
+
+        Detects the bank from the header row and, when ``bank_code`` names a
+        bank, validates the header against it. Raises ValueError on a mismatch
+        so a wrong-bank upload fails without a full extraction, and also when
+        the PDF cannot be read (e.g. it is encrypted and no password was given).
+        Returns the detected bank code, or None if the first page has no table to check.
+        """
+        # Never let rows from an earlier statement stand in for this one's first page
+        self._preflight = None
         try:
-            default_csv_path = os.path.splitext(pdf_path)[0] + ".csv"
-            with pdfplumber.open(pdf_path) as pdf, open(default_csv_path, "w", newline="") as f:
-                writer = csv.writer(f)
-                for page in pdf.pages:
-                    table = page.extract_table()
-                    if table:
-                        writer.writerows(table)
-            print("PDF converted to CSV successfully! Saved as:", default_csv_path)
-            self.csv_file = default_csv_path
-            
-            # Load the data and detect bank (but don't set bank_code yet)
-            temp_df = pd.read_csv(default_csv_path)
-            detected_bank = detect_bank(temp_df)
+            first_page_rows = extract_first_page_rows(pdf_path, self.pdf_password)
+        except Exception as e:
+            raise ValueError("Could not read the PDF. If it is password protected, "
+                             f"enter its password and try again. ({e.__class__.__name__})") from e
+        if not first_page_rows:
+            return None
+
+        header_df = pd.DataFrame(columns=_frame_columns(first_page_rows[0]))
+        if bank_code and bank_code != 'auto':
+            is_valid, error_message = validate_bank_statement(header_df, bank_code)
+            if not is_valid:
+                raise ValueError(error_message)
+
+        # analyze() continues from page two instead of extracting page one again
+        self._preflight = (pdf_path, first_page_rows)
+        detected_bank = detect_bank(header_df)
+        print(f"Preflight detected bank: {BANK_CONFIGS[detected_bank]['name']}")
+        return detected_bank
+
+    def analyze(self, pdf_path, workers=None, export_csv=False):
+        """
+        Extract the statement tables into ``self.raw_df`` and detect the bank.
+
+        Returns the raw DataFrame, or None if extraction failed. With
+        ``export_csv`` the rows are also written to ``<name>.csv``.
+        """
+        try:
+            preflight, self._preflight = self._preflight, None
+            if preflight and preflight[0] == pdf_path:
+                rows = preflight[1] + extract_statement_rows(pdf_path, workers, password=self.pdf_password, start_page=1)
+            else:
+                rows = extract_statement_rows(pdf_path, workers, password=self.pdf_password)
+            self.raw_df = rows_to_frame(rows)
+
+            if export_csv:
+                default_csv_path = os.path.splitext(pdf_path)[0] + ".csv"
+                with open(default_csv_path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerows(rows)
+                print("PDF converted to CSV successfully! Saved as:", default_csv_path)
+                self.csv_file = default_csv_path
+
+            # Detect bank (but don't set bank_code yet)
+            detected_bank = detect_bank(self.raw_df)
             detected_config = BANK_CONFIGS[detected_bank]
             print(f"Detected bank: {detected_config['name']}")
             
@@ -267,13 +582,16 @@ class AccountManagementAnalyzer:
             self._detected_bank = detected_bank
             self._detected_config = detected_config
             
-            return default_csv_path
+            return self.raw_df
         except Exception as e:
             print("An error occurred:", e)
             return None
 
     def show_data(self):
-        self.df = pd.read_csv(self.csv_file)
+        # Use the rows extracted by analyze(); read an exported CSV only when there are none
+        if self.raw_df is None:
+            self.raw_df = read_statement_csv(self.csv_file)
+        self.df = self.raw_df.copy()
         
         # If no bank is set, use detected bank
         if not self.bank_code:
@@ -321,7 +639,7 @@ class AccountManagementAnalyzer:
         narration_df.to_csv(narration_file_path, index=False)
         return narration_file_path
 
-    def preprocessing_and_analysis(self):
+    def preprocessing_and_analysis(self, render_graphs=True):
        # global df
       # Include your data preprocessing and analysis code here
       
@@ -353,129 +671,150 @@ class AccountManagementAnalyzer:
       # Rename column for consistency
       self.df.rename(columns={'Closing Balance*': 'Closing Balance'}, inplace=True)
       
-      # Use enhanced graph generation
-      from enhanced_graphs import create_enhanced_graphs
-      create_enhanced_graphs(self)
+      # Use enhanced graph generation (the Flask app renders charts on demand instead)
+      if render_graphs:
+          from enhanced_graphs import create_enhanced_graphs
+          create_enhanced_graphs(self)
       
       pass
 
-
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('punkt_tab')
-    def classification(self):
+    def classification(self, memo=None):
       # Include your transaction classification code here
       self.df['Narration'] = self.df['Narration'].astype(str).fillna('')
 
-      categories = {
-        "Food/Clothing": [
-            "zomato", "swiggy", "flipkart", "groceries", "amazon", "myntra", "ajio","grofers",
-            "nike", "adidas", "zepto", "bigbasket", "dmart", "reliance fresh", "spencers", "foodpanda",
-            "kfc", "mcdonalds", "dominos", "pizzahut", "subway", "burger king", "fbb", "pantaloons", "westside","Departmnt Store"
-        ],
-        "Entertainment": [
-            "netflix", "prime", "hotstar", "spotify", "google", "book my show", "jiocinema",
-            "hulu", "disney", "sony liv", "voot", "zee5", "itunes", "youtube premium", "audible", "gaana", "wynk"
-        ],
-        "Recharge": [
-            "airtel", "jio", "vodafone", "bsnl", "recharge", "top-up", "vi", "talktime", "prepaid", "postpaid",
-            "mobile recharge", "phonepe recharge", "paytm recharge","mobikwik recharge","Paytm"
-        ],
-        "Rent/Bills": [
-            "electricity", "water bill", "rent", "utility", "phonepe", "bbpsbp", "landlord",
-            "property tax", "maintenance", "gas bill", "internet bill", "dth recharge", "municipal tax"
-        ],
-        "Transport": [
-            "rapido", "ola", "uber", "metro", "rail", "bus", "flight", "taxi", "redbus", "irctc",
-            "indigo", "air india", "spicejet", "go air", "blablacar", "cab", "rickshaw", "fuel", "petrol", "diesel"
-        ],
-        "Emergency": [
-            "hospital", "doctor", "medical", "pharmacy", "cash deposit", "emergency", "ambulance",
-            "surgery", "clinic", "meds", "medlife", "pharmeasy", "apollo", "fortis", "max healthcare"
-        ],
-        "Banking": [
-            "airtel payments bank", "navi technologies", "banking", "loan", "credit card", "debit card",
-            "upi", "neft", "imps", "rtgs", "interest", "savings", "hdfc", "icici", "sbi", "axis bank", "kotak"
-        ],
-        "Gaming": [
-            "steam", "epic games", "pubg", "game", "valorant", "counter strike", "call of duty", "roblox",
-            "playstation", "xbox", "nintendo", "esports", "minecraft", "rummy", "poker", "fantasy cricket"
-        ],
-        "Trading": [
-            "zerodha", "upstox", "angel broking", "groww", "stocks", "equity", "mutual funds",
-            "investment", "bonds", "nse", "bse", "cryptocurrency", "bitcoin", "forex", "commodities", "shares"
-        ],
-        "Personal Transfer": []  #
-      }
-      stop_words = set(stopwords.words('english'))
-
-
+      # Label each distinct narration once with the compiled keyword automaton,
+      # reusing labels from the user's earlier statements when a memo is given
+      self.df['Category'] = get_transaction_classifier().classify_series(self.df['Narration'], memo=memo)
+      if memo is not None:
+          memo.save()
 
-      #classify transaction
-      def classify_transaction(text):
-        text = text.lower()
-        words = word_tokenize(text)
-        words = [word for word in words if word.isalnum() and word not in stop_words]
+      # Category distribution graph is now handled in enhanced_graphs.py
+      # (rendered on demand once the categories exist)
 
-        for category, keywords in categories.items():
-            if any(keyword in text for keyword in keywords):
-                return category
+      pass
 
-        return "Personal Transfer"
+    def trans_pred(self, future_days=30, mode='full', threshold=0.0):
+        # Include your transaction prediction code here
+      # mode='full' trains the LSTM/ARIMA models; mode='fast' uses the NumPy-only
+      # Holt and AR forecasts, which fill the same prediction_df columns.
+      # Alongside prediction_df, self.simulation holds Monte Carlo balance bands and
+      # the chance of the balance falling below `threshold` (see balance_simulation)
+      if mode not in FORECAST_MODES:
+          raise ValueError(f"Unknown forecast mode '{mode}', expected one of {', '.join(FORECAST_MODES)}")
 
+      #global df, prediction_df
 
+      # processing the data around the dates (preprocessing_and_analysis() has
+      # usually typed the columns already; only parse what is still text)
+      if not pd.api.types.is_datetime64_any_dtype(self.df["Date"]):
+          try:
+              if self.bank_config and 'date_format' in self.bank_config:
+                  self.df["Date"] = pd.to_datetime(self.df["Date"], format=self.bank_config['date_format'])
+              else:
+                  self.df["Date"] = pd.to_datetime(self.df["Date"], format="%d/%m/%Y")
+          except:
+              # Fallback to default parsing
+              self.df["Date"] = pd.to_datetime(self.df["Date"], format="%d/%m/%Y")
 
-      self.df['Category'] = self.df['Narration'].apply(classify_transaction)
+      for column in ["Withdrawal Amount", "Deposit Amount", "Closing Balance"]:
+          if not pd.api.types.is_numeric_dtype(self.df[column]):
+              self.df[column] = pd.to_numeric(self.df[column].astype(str).str.replace(",", ""), errors="coerce")
+      self.df[["Withdrawal Amount", "Deposit Amount"]] = self.df[["Withdrawal Amount", "Deposit Amount"]].fillna(0).astype(float)
 
-      self.df.to_csv("classified_narrations.csv", index=False)
 
-      self.df
-      #np.savetxt("classified_narrations.csv", self.df.values, delimiter=",", fmt="%s")
+      # Sort by Date
+      self.df = self.df.sort_values("Date", kind="stable")  # Stable: same-day rows keep statement order
+
+      # The models see one end-of-day balance per calendar day, not one row per transaction
+      # (built before missing balances are zero-filled, so those rows are skipped instead)
+      from daily_series import daily_series
+      self.daily_df = daily_series(self.df)
+      self.df["Closing Balance"] = self.df["Closing Balance"].fillna(0).astype(float)
+      balances = self.daily_df["Closing Balance"].values
+      if mode == 'full' and len(balances) < FULL_FORECAST_MIN_DAYS:
+          raise ValueError(f"The full forecast needs transactions spanning at least {FULL_FORECAST_MIN_DAYS} days, "
+                           f"but this statement covers {len(balances)}. Use the fast forecast instead.")
+
+      # Forecast the full horizon once per dataset and mode; each `future_days`
+      # is then a slice of the stored forecast instead of another model run
+      from forecast_cache import forecast_cache_key
+      horizon = max(future_days, FORECAST_MAX_HORIZON)
+      model_cache = get_forecast_model_cache()
+      forecast_key = forecast_cache_key(balances, FORECAST_SEQ_LENGTH,
+                                        {'mode': mode, 'horizon': horizon, 'models': FORECAST_CONFIG})
+      forecast = model_cache.get(forecast_key)
+      if forecast is None:
+          if mode == 'fast':
+              lstm_values, arima_values, metrics = fast_forecast(balances, horizon)
+          else:
+              lstm_values, arima_values, metrics = self._full_forecast(balances, horizon)
+          forecast = {'lstm': lstm_values, 'arima': arima_values, 'metrics': metrics}
+          model_cache.put(forecast_key, forecast)
 
+      predicted_values = forecast['lstm'][:future_days]
+      forecast_arima = forecast['arima'][:future_days]
+      metrics = forecast['metrics']
+      self.forecast_metrics = metrics
 
-      # Category distribution graph is now handled in enhanced_graphs.py
-      # during preprocessing_and_analysis() call
+      # Prepare future dataframe
+      dates_future = pd.date_range(self.daily_df["Date"].iloc[-1], periods=future_days+1)[1:]
+      prediction_df = pd.DataFrame({
+          "Date": dates_future,
+          "LSTM_Prediction": predicted_values,
+          "ARIMA_Prediction": forecast_arima
+      })
 
-      pass
+      self.prediction_df = prediction_df
 
-    def trans_pred(self, future_days=30):
-        # Include your transaction prediction code here
+      from balance_simulation import simulate_balances
+      self.simulation = simulate_balances(self.daily_df, future_days, threshold=threshold)
 
-      #global df, prediction_df
+      # comparing both model and predict balance after n days
+      current_balance = self.df["Closing Balance"].iloc[-1]
 
-      # processing the data around the dates
-      try:
-          if self.bank_config and 'date_format' in self.bank_config:
-              self.df["Date"] = pd.to_datetime(self.df["Date"], format=self.bank_config['date_format'])
-          else:
-              self.df["Date"] = pd.to_datetime(self.df["Date"], format="%d/%m/%Y")
-      except:
-          # Fallback to default parsing
-          self.df["Date"] = pd.to_datetime(self.df["Date"], format="%d/%m/%Y")
+      print(f"Current Balance: ₹{current_balance:.2f}")
+      print("\nFuture Predictions (ARIMA & LSTM):\n", self.prediction_df)
+      print(f"Chance of falling below ₹{threshold:.2f}: {self.simulation['probability_below']:.1%}")
 
-      self.df["Withdrawal Amount"] = pd.to_numeric(self.df["Withdrawal Amount"].astype(str).replace(",", ""), errors="coerce").fillna(0).astype(float)
-      self.df["Deposit Amount"] = pd.to_numeric(self.df["Deposit Amount"].astype(str).replace(",", ""), errors="coerce").fillna(0).astype(float)
-      self.df["Closing Balance"] = pd.to_numeric(self.df["Closing Balance"].astype(str).replace(",", ""), errors="coerce").fillna(0).astype(float)
+      for name, scores in metrics.items():
+          print(f"MSME_{name}:{scores['msme']}")
+      for name, scores in metrics.items():
+          print(f"RMAE_{name}:{scores['rmae']}")
 
+      return current_balance, self.prediction_df
 
-      # Sort by Date
-      self.df = self.df.sort_values("Date")
+    def _full_forecast(self, balances, future_days):
+      """LSTM and ARIMA(5,1,0) forecasts of a daily balance series, with test-set metrics"""
+      from sklearn.preprocessing import MinMaxScaler
+      import tensorflow as tf
+      from tensorflow.keras.models import Sequential
+      from tensorflow.keras.layers import LSTM, Dense
+      from statsmodels.tsa.arima.model import ARIMA
+
+      # Models trained on this exact balance series and config are reused
+      from forecast_cache import forecast_cache_key
+      seq_length = FORECAST_SEQ_LENGTH
+      model_cache = get_forecast_model_cache()
+      cache_key = forecast_cache_key(balances, seq_length, FORECAST_CONFIG)
+      cached = model_cache.get(cache_key)
 
       # Create time series data
-      data = self.df[["Closing Balance"]].values
-      scaler = MinMaxScaler(feature_range=(0, 1))
-      data_scaled = scaler.fit_transform(data)
+      data = balances.reshape(-1, 1)
+      if cached is not None:
+          scaler = cached['scaler']
+          data_scaled = scaler.transform(data)
+      else:
+          scaler = MinMaxScaler(feature_range=(0, 1))
+          data_scaled = scaler.fit_transform(data)
 
       # LSTM MODEL
       def create_sequences(data, seq_length):
-          X, y = [], []
-          for i in range(len(data) - seq_length):
-              X.append(data[i:i+seq_length])
-              y.append(data[i+seq_length])
-          return np.array(X), np.array(y)
+          # Strided view of every seq_length window (no copies); each window predicts the next value
+          X = np.lib.stride_tricks.sliding_window_view(data[:-1], seq_length, axis=0).transpose(0, 2, 1)
+          y = data[seq_length:]
+          return X, y
 
       # sequence
-      seq_length = 5  # Use past 5 days to predict next day
       X, y = create_sequences(data_scaled, seq_length)
 
 
@@ -485,77 +824,74 @@ class AccountManagementAnalyzer:
       X_test, y_test = X[train_size:], y[train_size:]
 
       # LSTM Model
-      model = Sequential([
-          LSTM(50, return_sequences=True),
-          LSTM(50),
-          Dense(1)
-      ])
-      model.compile(optimizer='adam', loss='mse')
-      model.fit(X_train, y_train, epochs=50, batch_size=16, verbose=1)
+      model = cached.get('lstm_model') if cached is not None else None
+      if model is None:
+          model = Sequential([
+              LSTM(FORECAST_CONFIG['lstm_units'], return_sequences=True),
+              LSTM(FORECAST_CONFIG['lstm_units']),
+              Dense(1)
+          ])
+          model.compile(optimizer='adam', loss='mse')
+          if cached is not None:
+              # Loaded from disk: rebuild the network and restore the trained weights
+              model.build((None, seq_length, 1))
+              model.set_weights(cached['lstm_weights'])
+              cached['lstm_model'] = model
+          else:
+              model.fit(X_train, y_train, epochs=FORECAST_CONFIG['epochs'],
+                        batch_size=FORECAST_CONFIG['batch_size'], verbose=1)
 
 
-      # Predict future balance
-      predictions = []
-      last_sequence = X_test[-1]
-      for _ in range(future_days):
-          next_day_pred = model.predict(last_sequence.reshape(1, seq_length, 1))
-          predictions.append(next_day_pred[0, 0])
-          last_sequence = np.vstack((last_sequence[1:], next_day_pred))
+      # Predict future balance: the whole horizon in one compiled rollout
+      rollout = cached.get('lstm_rollout') if cached is not None else None
+      if rollout is None:
+          rollout = make_lstm_rollout(model)
+          if cached is not None:
+              cached['lstm_rollout'] = rollout
+      predictions = rollout(tf.constant(X_test[-1][np.newaxis], dtype=tf.float32),
+                            tf.constant(future_days)).numpy()
 
-      predicted_values = scaler.inverse_transform(np.array(predictions).reshape(-1, 1))
+      predicted_values = scaler.inverse_transform(predictions.reshape(-1, 1))
 
 
 
       # ARIMA Model
-      model_arima = ARIMA(self.df["Closing Balance"], order=(5,1,0))
-      model_arima_fit = model_arima.fit()
+      if cached is not None:
+          model_arima_fit = cached['arima']
+      else:
+          model_arima = ARIMA(balances, order=FORECAST_CONFIG['arima_order'])
+          model_arima_fit = model_arima.fit()
+          model_cache.put(cache_key, {
+              'scaler': scaler,
+              'lstm_weights': model.get_weights(),
+              'lstm_model': model,
+              'lstm_rollout': rollout,
+              'arima': model_arima_fit
+          })
       forecast_arima = model_arima_fit.forecast(steps=future_days)
 
+      predicted_values = predicted_values.flatten()
+      forecast_arima = np.asarray(forecast_arima)
 
-      # Prepare future dataframe
-      dates_future = pd.date_range(self.df["Date"].iloc[-1], periods=future_days+1)[1:]
-      prediction_df = pd.DataFrame({
-          "Date": dates_future,
-          "LSTM_Prediction": predicted_values.flatten(),
-          "ARIMA_Prediction": forecast_arima
-      })
-
-      self.prediction_df = prediction_df
-
-      # comparing both model and predict balance after n days
-      current_balance = self.df["Closing Balance"].iloc[-1]
-
-      print(f"Current Balance: ₹{current_balance:.2f}")
-      print("\nFuture Predictions (ARIMA & LSTM):\n", self.prediction_df)
-      
       # analysing error of model
       actual_balances = scaler.inverse_transform(y_test)
       lstm_predictions = scaler.inverse_transform(model.predict(X_test))
-      
-      # Slice the forecast to match the length of the test set for metric calculation
-      arima_predictions_for_metrics = forecast_arima[:len(y_test)]
-      
-      # Ensure arrays for metrics have the same size to avoid broadcasting errors
-      metric_len = len(arima_predictions_for_metrics)
-      actual_balances_flat = actual_balances.flatten()[:metric_len]
-      lstm_predictions_flat = lstm_predictions.flatten()[:metric_len]
-
-      msme_lstm = np.mean((actual_balances_flat - lstm_predictions_flat) ** 2) / np.mean(actual_balances_flat ** 2)
-      msme_arima = np.mean((actual_balances_flat - arima_predictions_for_metrics) ** 2) / np.mean(actual_balances_flat ** 2)
 
-      from sklearn.metrics import mean_absolute_error
-      mae_lstm = mean_absolute_error(actual_balances_flat, lstm_predictions_flat)
-      rmae_lstm = mae_lstm / np.mean(actual_balances_flat)
+      # Score ARIMA on the same test window: fit on the days before it and forecast
+      # across it (a forecast past the end of the series says nothing about the test set)
+      test_start = train_size + seq_length
+      arima_predictions_for_metrics = np.asarray(
+          ARIMA(balances[:test_start], order=FORECAST_CONFIG['arima_order']).fit().forecast(steps=len(y_test))
+      )
 
-      mae_arima = mean_absolute_error(actual_balances_flat, arima_predictions_for_metrics)
-      rmae_arima = mae_arima / np.mean(actual_balances_flat)
+      actual_balances_flat = actual_balances.flatten()
+      lstm_predictions_flat = lstm_predictions.flatten()
 
-      print(f"MSME_LSTM:{msme_lstm}")
-      print(f"MSME_ARIMA:{msme_arima}")
-      print(f"RMAE_LSTM:{rmae_lstm}")
-      print(f"RMAE_ARIMA:{rmae_arima}")
-
-      return current_balance, self.prediction_df
+      metrics = {
+          'LSTM': forecast_metrics(actual_balances_flat, lstm_predictions_flat),
+          'ARIMA': forecast_metrics(actual_balances_flat, arima_predictions_for_metrics)
+      }
+      return predicted_values, forecast_arima, metrics
 
     def budget_system(self):
       # Include your budgeting system code here
@@ -563,17 +899,10 @@ class AccountManagementAnalyzer:
       #global prediction_df
     # setting the classification dataset
 
-      cat = pd.read_csv("classified_narrations.csv") # add header=None
-      
-      # Use existing column names instead of hardcoded ones
-      # This prevents column mismatch errors for different banks
-      if len(cat.columns) != 8:
-          # If columns don't match expected count, use the CSV as-is
-          pass
-      else:
-          column_names = ["Date", "Narration", "Chq. / Ref No.", "Value Date",
-                          "Withdrawal Amount", "Deposit Amount", "Closing Balance", "Category"]
-          cat.columns = column_names
+      # Budget from the classified frame in memory; classify it first if needed
+      if 'Category' not in self.df.columns:
+          self.classification()
+      cat = self.df
 
 
       # model mean (ARIMA and LSTM)
@@ -609,9 +938,14 @@ class AccountManagementAnalyzer:
       essential_expense = predicted_expense * 0.7
       non_essential_expense = predicted_expense * 0.3
 
+      # Every savings ratio / essential split / category cap combination at once,
+      # so the UI can explore other budgets without another request
+      from budget_scenarios import budget_scenarios
+      scenarios = budget_scenarios(predicted_income, predicted_expense, category_expense)
+
       # Use enhanced budget graph generation
       from enhanced_graphs import create_budget_graphs
-      create_budget_graphs(category_expense, dynamic_savings, essential_expense, non_essential_expense)
+      self.charts.update(create_budget_graphs(category_expense, dynamic_savings, essential_expense, non_essential_expense))
 
       # Check for overspending to generate warnings
       over_spending = adaptive_allocation[adaptive_allocation > category_expense]
@@ -633,7 +967,8 @@ class AccountManagementAnalyzer:
           'category_expense': category_expense.to_dict(),
           'adaptive_allocation': adaptive_allocation.to_dict(),
           'over_spending': over_spending_dict,
-          'income_warning': income_warning
+          'income_warning': income_warning,
+          'scenarios': scenarios
       }
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%Y-%m-%d'
+
+def frame_records(df, date_format=DATE_FORMAT):
+    """
+    Convert a DataFrame to a list of JSON-ready row dicts, column by column.
+
+    Datetime columns become ``date_format`` strings, period columns their
+    string form, and missing values None; numbers come out as Python
+    int/float (to_dict boxes them natively), so no per-value conversion runs.
+    """
+    columns = {}
+    for name, column in df.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            column = column.dt.strftime(date_format)
+        elif isinstance(column.dtype, pd.PeriodDtype):
+            column = column.astype(str)
+        if column.hasnans:
+            column = column.astype(object).where(column.notna(), None)
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index).to_dict(orient='records')
+
+def to_jsonable(value, date_format=DATE_FORMAT):
+    """
+    Recursively convert pandas/NumPy values (frames, series, arrays, scalars,
+    timestamps) inside dicts and lists into plain JSON types.
+    """
+    if isinstance(value, dict):
+        return {key: to_jsonable(item, date_format) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item, date_format) for item in value]
+    if isinstance(value, pd.DataFrame):
+        return frame_records(value, date_format)
+    if isinstance(value, pd.Series):
+        return to_jsonable(value.to_dict(), date_format)
+    if isinstance(value, np.ndarray):
+        return value.tolist() if value.dtype.kind in 'biuf' else to_jsonable(value.tolist(), date_format)
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime(date_format)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from statement_summary import merge_summaries, summarize, summary_complete
+
+# Columns that identify a transaction across overlapping statements
+REF_COLUMN = "Chq. / Ref No."
+
+def account_id(user_id, bank_code):
+    """Return the history id for one user's account at one bank"""
+    return f"{user_id}-{bank_code}"
+
+def transaction_keys(df):
+    """
+    Return one uint64 dedupe key per row, hashed from the transaction date,
+    reference number, signed amount and closing balance.
+    """
+    refs = df[REF_COLUMN] if REF_COLUMN in df.columns else pd.Series('', index=df.index)
+    key_frame = pd.DataFrame({
+        'date': pd.to_datetime(df["Date"]).dt.normalize(),
+        'ref': refs.fillna('').astype(str).str.strip(),
+        'amount': (df["Deposit Amount"].fillna(0) - df["Withdrawal Amount"].fillna(0)).round(2),
+        'balance': df["Closing Balance"].round(2)
+    })
+    return pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+
+class StatementHistory:
+    """
+    Transaction history of one account, grown one statement at a time.
+
+    Rows are deduplicated on transaction_keys(), so overlapping or repeated
+    uploads only add what is new, and only those rows are classified. The
+    history's summary (see statement_summary) is merged with the summary of
+    the new rows instead of being recomputed over the whole history, so an
+    upload costs what the statement costs, not what the history does. Rows
+    and summary live in a TransactionStore; ``version`` changes with every
+    save that adds rows.
+    """
+
+    def __init__(self, account, store):
+        self.account = account
+        self.store = store
+        self.summary, self.version = store.load_summary(account)
+        if self.summary is not None and not summary_complete(self.summary):
+            # Saved before an aggregate was added to the summary: rebuild it once
+            self.summary = summarize(store.read(account))
+            store.save_summary(account, self.summary)
+        self._pending = []  # (rows, keys) added since the last save()
+
+    def __len__(self):
+        return self.summary['transaction_count'] if self.summary else 0
+
+    def read(self, start=None, end=None, categories=None, columns=None):
+        """Load the saved history (or part of it, see TransactionStore.read)"""
+        return self.store.read(self.account, start, end, categories, columns)
+
+    def append_statement(self, df, classify):
+        """
+        Add the rows of a processed statement that the history does not have yet.
+
+        ``df`` is typed (after preprocessing_and_analysis) but not classified;
+        ``classify(rows)`` returns the Category labels for the new rows only.
+        Returns the added rows (classified); they are stored by save().
+        """
+        keys = transaction_keys(df)
+        known = [self.store.existing_keys(self.account, keys)] + [pending_keys for _, pending_keys in self._pending]
+        is_new = ~np.isin(keys, np.concatenate(known)) & ~pd.Series(keys).duplicated().to_numpy()
+        rows = df[is_new].copy()
+        if rows.empty:
+            return rows
+
+        rows["Category"] = classify(rows).to_numpy()
+        # Stable, so same-day rows keep their statement order, as the store returns them
+        order = np.argsort(rows["Date"].to_numpy(), kind="stable")
+        rows = rows.iloc[order].reset_index(drop=True)
+        self._pending.append((rows, keys[is_new][order]))
+        self.summary = merge_summaries(self.summary, summarize(rows))
+        return rows
+
+    def save(self):
+        """Store the added rows and the updated summary in one transaction"""
+        if not self._pending:
+            return
+        rows = pd.concat([pending_rows for pending_rows, _ in self._pending], ignore_index=True)
+        keys = np.concatenate([pending_keys for _, pending_keys in self._pending])
+        self.version = self.store.write(self.account, rows, keys, summary=self.summary)
+        self._pending = []
@@ -0,0 +1,139 @@
+import pandas as pd
+
+from serialization import frame_records
+
+TOP_N = 5
+
+# name -> (aggregate(df), merge(old, new, old_summary, new_summary)), both returning
+# JSON-ready values; add entries to extend the summary. merge combines the values of
+# two disjoint sets of transactions, so account histories can grow a summary one
+# statement at a time (see merge_summaries).
+SUMMARY_AGGREGATES = {}
+
+def summary_aggregate(name, merge):
+    """Register a function as one aggregate of the statement summary, with its merge"""
+    def register(function):
+        SUMMARY_AGGREGATES[name] = (function, merge)
+        return function
+    return register
+
+def _add(old, new, old_summary, new_summary):
+    return old + new
+
+def _add_counts(old, new, old_summary, new_summary):
+    totals = dict(old)
+    for key, value in new.items():
+        totals[key] = totals.get(key, 0) + value
+    # Largest first, the order value_counts() gives
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+def _earliest(old, new, old_summary, new_summary):
+    return min(date for date in (old, new) if date) if old or new else None
+
+def _latest(old, new, old_summary, new_summary):
+    return max(date for date in (old, new) if date) if old or new else None
+
+def _latest_balance(old, new, old_summary, new_summary):
+    # Same-day rows from a later statement come after the stored ones
+    if not new_summary['last_date']:
+        return old
+    if not old_summary['last_date'] or new_summary['last_date'] >= old_summary['last_date']:
+        return new
+    return old
+
+def _add_monthly(old, new, old_summary, new_summary):
+    months = {record['Month']: dict(record) for record in old}
+    for record in new:
+        month = months.setdefault(record['Month'], {'Month': record['Month']})
+        for column, value in record.items():
+            if column != 'Month':
+                month[column] = month.get(column, 0.0) + value
+    return [months[month] for month in sorted(months)]
+
+def _top(column):
+    def merge(old, new, old_summary, new_summary):
+        return sorted(old + new, key=lambda record: record[column], reverse=True)[:TOP_N]
+    return merge
+
+@summary_aggregate('transaction_count', _add)
+def _transaction_count(df):
+    return len(df)
+
+@summary_aggregate('total_withdrawals', _add)
+def _total_withdrawals(df):
+    return float(df["Withdrawal Amount"].sum())
+
+@summary_aggregate('total_deposits', _add)
+def _total_deposits(df):
+    return float(df["Deposit Amount"].sum())
+
+@summary_aggregate('net_flow', _add)
+def _net_flow(df):
+    return float(df["Deposit Amount"].sum() - df["Withdrawal Amount"].sum())
+
+@summary_aggregate('current_balance', _latest_balance)
+def _current_balance(df):
+    # Last known balance; rows without one (e.g. a trailing summary line) are skipped
+    balances = df["Closing Balance"].dropna()
+    return float(balances.iloc[-1]) if len(balances) else 0.0
+
+@summary_aggregate('first_date', _earliest)
+def _first_date(df):
+    return df["Date"].min().strftime('%Y-%m-%d') if len(df) else None
+
+@summary_aggregate('last_date', _latest)
+def _last_date(df):
+    return df["Date"].max().strftime('%Y-%m-%d') if len(df) else None
+
+@summary_aggregate('category_counts', _add_counts)
+def _category_counts(df):
+    if "Category" not in df.columns:
+        return {}
+    return {category: int(count) for category, count in df["Category"].value_counts().items()}
+
+@summary_aggregate('category_withdrawals', _add_counts)
+def _category_withdrawals(df):
+    if "Category" not in df.columns:
+        return {}
+    totals = df.groupby("Category")["Withdrawal Amount"].sum().sort_values(ascending=False)
+    return {category: float(total) for category, total in totals.items()}
+
+@summary_aggregate('monthly', _add_monthly)
+def _monthly(df):
+    monthly = df.groupby(df["Date"].dt.to_period('M').rename('Month'))[
+        ["Withdrawal Amount", "Deposit Amount"]].sum().reset_index()
+    return frame_records(monthly)
+
+@summary_aggregate('top_withdrawals', _top("Withdrawal Amount"))
+def _top_withdrawals(df):
+    return frame_records(df.nlargest(TOP_N, "Withdrawal Amount")[["Date", "Narration", "Withdrawal Amount"]])
+
+@summary_aggregate('top_deposits', _top("Deposit Amount"))
+def _top_deposits(df):
+    return frame_records(df.nlargest(TOP_N, "Deposit Amount")[["Date", "Narration", "Deposit Amount"]])
+
+def summarize(df):
+    """
+    Compute every registered aggregate of a typed transaction frame.
+
+    The result is a plain dict of JSON types, so it can be cached with the
+    processed statement and handed to templates, reports and the assistant as is.
+    Category aggregates are empty until the frame is classified.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        df = df.assign(Date=pd.to_datetime(df["Date"]))
+    return {name: aggregate(df) for name, (aggregate, _) in SUMMARY_AGGREGATES.items()}
+
+def summary_complete(summary):
+    """True when ``summary`` has every registered aggregate (it may predate newer ones)"""
+    return summary is not None and all(name in summary for name in SUMMARY_AGGREGATES)
+
+def merge_summaries(old, new):
+    """
+    Summary of two disjoint sets of transactions from their summaries, where
+    ``new`` holds the later-stored rows. Equals summarize() over both, up to
+    the order of ties in the top-N lists.
+    """
+    if old is None:
+        return new
+    return {name: merge(old[name], new[name], old, new) for name, (_, merge) in SUMMARY_AGGREGATES.items()}
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+class KeywordClassifier:
+    """
+    Multi-pattern keyword classifier backed by an Aho-Corasick automaton.
+
+    ``categories`` is an ordered mapping of category -> keywords. A text is
+    labelled with the first category (in mapping order) that has any keyword
+    occurring as a substring of the lowercased text, or ``default`` when
+    nothing matches. The keyword table is compiled once, so labelling a text
+    costs one pass over its characters regardless of how many keywords exist.
+    """
+
+    def __init__(self, categories, default="Personal Transfer"):
+        self.labels = list(categories)
+        self.default = default
+        # Identifies the keyword table, so memoised labels from another table are never reused
+        self.fingerprint = hashlib.sha256(
+            json.dumps([list(categories.items()), default]).encode()
+        ).hexdigest()
+        self._no_match = len(self.labels)
+
+        # Trie: per-node transitions, failure links and the best (lowest) category rank
+        self._goto = [{}]
+        self._fail = [0]
+        self._rank = [self._no_match]
+
+        for rank, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                self._add_keyword(keyword, rank)
+        self._build_failure_links()
+
+    def _add_keyword(self, keyword, rank):
+        # Keywords are matched as written against lowercased text, exactly like the
+        # previous `keyword in text.lower()` scan
+        node = 0
+        for ch in keyword:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._rank.append(self._no_match)
+            node = next_node
+        self._rank[node] = min(self._rank[node], rank)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # A match ending here also ends every keyword on the failure chain
+                self._rank[child] = min(self._rank[child], self._rank[self._fail[child]])
+                queue.append(child)
+
+    def _best_rank(self, text):
+        goto, fail, rank = self._goto, self._fail, self._rank
+        node = 0
+        best = self._no_match
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if rank[node] < best:
+                best = rank[node]
+                if best == 0:
+                    break  # Nothing can beat the first category
+        return best
+
+    def _label(self, lowered_text):
+        best = self._best_rank(lowered_text)
+        return self.labels[best] if best < self._no_match else self.default
+
+    def classify(self, text):
+        """Return the category for a single narration"""
+        return self._label(str(text).lower())
+
+    def classify_series(self, narrations, memo=None):
+        """
+        Label a whole column of narrations, returning a Series aligned with the input.
+
+        Statements repeat the same payees constantly, so only the distinct
+        normalised narrations are classified and the labels are broadcast back
+        through their factorized codes. An optional CategoryMemo supplies labels
+        seen in earlier statements and records the new ones.
+        """
+        normalised = narrations.astype(str).str.lower()
+        codes, uniques = pd.factorize(normalised)
+
+        known = memo.lookup(uniques) if memo is not None else {}
+        unique_labels = np.empty(len(uniques), dtype=object)
+        learned = {}
+        for i, text in enumerate(uniques):
+            label = known.get(text)
+            if label is None:
+                label = learned[text] = self._label(text)
+            unique_labels[i] = label
+
+        if memo is not None and learned:
+            memo.update(learned)
+
+        return pd.Series(unique_labels[codes], index=narrations.index, dtype=object)
+
+class CategoryMemo:
+    """
+    Persistent memo of normalised narration -> category.
+
+    Kept per user as a JSON file so recurring payees are classified once
+    across all of their statements. The memo is stamped with the
+    classifier's fingerprint and discarded if the keyword table changes.
+    """
+
+    def __init__(self, fingerprint, path=None, max_entries=50000):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path, fingerprint, max_entries=50000):
+        memo = cls(fingerprint, path, max_entries)
+        try:
+            with open(path, encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('fingerprint') == fingerprint:
+                memo.entries = stored.get('entries', {})
+        except (OSError, ValueError):
+            pass  # Missing or unreadable memo: start fresh
+        return memo
+
+    def lookup(self, narrations):
+        """Return {narration: category} for the narrations already memoised"""
+        entries = self.entries
+        return {text: entries[text] for text in narrations if text in entries}
+
+    def update(self, labels):
+        self.entries.update(labels)
+        # Forget the oldest narrations once the memo is full
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            for text in list(self.entries)[:overflow]:
+                del self.entries[text]
+        self.dirty = True
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Write-then-rename so concurrent requests never read a half-written memo
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,198 @@
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_DB_PATH = os.environ.get('SPENDIFY_DB_PATH', 'spendify.db')
+
+# SQLite's default limit on bound parameters per statement
+MAX_QUERY_PARAMS = 900
+
+# Standardised frame column -> typed store column
+STORE_COLUMNS = {
+    "Date": "date",                       # ISO 'YYYY-MM-DD', so ranges compare as text
+    "Narration": "narration",
+    "Chq. / Ref No.": "ref",
+    "Value Date": "value_date",
+    "Withdrawal Amount": "withdrawal",
+    "Deposit Amount": "deposit",
+    "Closing Balance": "balance",
+    "Category": "category",
+}
+AMOUNT_COLUMNS = ["Withdrawal Amount", "Deposit Amount", "Closing Balance"]
+OPTIONAL_COLUMNS = ["Chq. / Ref No.", "Value Date"]  # Not every bank's statement has these
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    txn_key INTEGER,
+    date TEXT NOT NULL,
+    narration TEXT,
+    ref TEXT,
+    value_date TEXT,
+    withdrawal REAL NOT NULL DEFAULT 0,
+    deposit REAL NOT NULL DEFAULT 0,
+    balance REAL,
+    category TEXT,
+    PRIMARY KEY (account, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (account, date, seq);
+CREATE INDEX IF NOT EXISTS transactions_category ON transactions (account, category, date);
+CREATE INDEX IF NOT EXISTS transactions_key ON transactions (account, txn_key);
+CREATE TABLE IF NOT EXISTS accounts (
+    account TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,  -- Bumped by every write
+    summary TEXT                         -- statement_summary of all the account's rows
+);
+"""
+
+class TransactionStore:
+    """
+    Persistent store of standardised, classified transactions (SQLite).
+
+    Rows are grouped by ``account``: an account history, or a single
+    uploaded statement. Columns are typed (ISO dates, REAL amounts) and
+    indexed on date and category, so read() can load just a date range or a
+    few categories of an account instead of parsing a whole export. Reads
+    come back as the same typed frame the analysis pipeline produces, in
+    date order with same-day rows kept in statement order.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    readers are not blocked while an upload is written.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    connection.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.connection = connection
+        return connection
+
+    def write(self, account, df, keys=None, replace=False, summary=None):
+        """
+        Append the rows of a typed frame to ``account``, after any it already holds.
+
+        ``keys`` are optional uint64 dedupe keys (statement_history.transaction_keys),
+        one per row. With ``replace`` the account's existing rows are dropped first.
+        ``summary`` (of all the account's rows after the write) is saved in the
+        same transaction, and the account's version is bumped.
+        Returns the new version.
+        """
+        connection = self._connection()
+        with connection:
+            if replace:
+                connection.execute("DELETE FROM transactions WHERE account = ?", (account,))
+            next_seq = connection.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM transactions WHERE account = ?", (account,)).fetchone()[0]
+            connection.executemany(
+                f"INSERT INTO transactions (account, seq, txn_key, {', '.join(STORE_COLUMNS.values())}) "
+                f"VALUES ({', '.join('?' * (len(STORE_COLUMNS) + 3))})",
+                self._rows(account, next_seq, df, keys))
+            connection.execute(
+                "INSERT INTO accounts (account, version, summary) VALUES (?, 1, ?) "
+                "ON CONFLICT(account) DO UPDATE SET version = version + 1, summary = excluded.summary",
+                (account, json.dumps(summary) if summary is not None else None))
+            return connection.execute(
+                "SELECT version FROM accounts WHERE account = ?", (account,)).fetchone()[0]
+
+    @staticmethod
+    def _rows(account, first_seq, df, keys):
+        n = len(df)
+        columns = [[account] * n, range(first_seq, first_seq + n)]
+        # SQLite integers are signed 64-bit, so store the uint64 keys' bit pattern
+        columns.append(np.asarray(keys, dtype=np.uint64).view(np.int64).tolist() if keys is not None else [None] * n)
+        columns.append(pd.to_datetime(df["Date"]).dt.strftime('%Y-%m-%d').tolist())
+        for column in STORE_COLUMNS:
+            if column == "Date":
+                continue
+            if column not in df.columns:
+                columns.append([None] * n)
+            elif column in AMOUNT_COLUMNS:
+                values = df[column].astype(float)
+                columns.append(values.astype(object).where(values.notna(), None).tolist())
+            else:
+                values = df[column]
+                columns.append(values.astype(str).where(values.notna(), None).tolist())
+        return zip(*columns)
+
+    def read(self, account, start=None, end=None, categories=None, columns=None):
+        """
+        Load an account's transactions as a typed frame, or an empty one.
+
+        ``start``/``end`` bound the transaction date (inclusive), ``categories``
+        limits the rows to those categories and ``columns`` to those frame columns.
+        """
+        columns = list(STORE_COLUMNS) if columns is None else [c for c in STORE_COLUMNS if c in columns]
+        where, params = ["account = ?"], [account]
+        if start is not None:
+            where.append("date >= ?")
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            where.append("date <= ?")
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        if categories is not None:
+            categories = list(categories)
+            where.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+
+        select = ', '.join(f'{STORE_COLUMNS[c]} AS "{c}"' for c in columns)
+        df = pd.read_sql_query(
+            f"SELECT {select} FROM transactions WHERE {' AND '.join(where)} ORDER BY date, seq",
+            self._connection(), params=params)
+        if "Date" in df.columns:
+            df["Date"] = pd.to_datetime(df["Date"], format='%Y-%m-%d')
+        for column in AMOUNT_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype(float)
+        missing = [c for c in OPTIONAL_COLUMNS if c in df.columns and len(df) and df[c].isna().all()]
+        return df.drop(columns=missing)
+
+    def existing_keys(self, account, keys):
+        """Return those of the uint64 ``keys`` already stored for ``account``"""
+        # Looked up through the (account, txn_key) index, so the cost follows the
+        # statement being added rather than the size of the history
+        candidates = np.unique(np.asarray(keys, dtype=np.uint64)).view(np.int64).tolist()
+        connection = self._connection()
+        found = []
+        for i in range(0, len(candidates), MAX_QUERY_PARAMS):
+            chunk = candidates[i:i + MAX_QUERY_PARAMS]
+            found.extend(key for (key,) in connection.execute(
+                f"SELECT txn_key FROM transactions WHERE account = ? AND txn_key IN ({', '.join('?' * len(chunk))})",
+                [account] + chunk))
+        return np.array(found, dtype=np.int64).view(np.uint64)
+
+    def count(self, account):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM transactions WHERE account = ?", (account,)).fetchone()[0]
+
+    def load_summary(self, account):
+        """Return ``(summary, version)`` saved for ``account``; ``(None, 0)`` if it was never written"""
+        row = self._connection().execute(
+            "SELECT summary, version FROM accounts WHERE account = ?", (account,)).fetchone()
+        if row is None:
+            return None, 0
+        return (json.loads(row[0]) if row[0] else None), row[1]
+
+    def save_summary(self, account, summary):
+        """Replace the saved summary of ``account`` without changing its rows or version"""
+        connection = self._connection()
+        with connection:
+            connection.execute("UPDATE accounts SET summary = ? WHERE account = ?", (json.dumps(summary), account))
@@ -2,6 +2,8 @@ import streamlit as st
 import os
 import pandas as pd
 from main import AccountManagementAnalyzer, BANK_CONFIGS
+from enhanced_graphs import render_graph
+from statement_summary import summarize
 
 st.set_page_config(page_title="Account Analyzer", layout="wide")
 
@@ -57,9 +59,17 @@ if uploaded_file:
             else:
                 st.success("🔓 Password correct. File decrypted!")
 
-        csv_path = analyzer.analyze(pdf_path)
-        if csv_path is None or not os.path.exists(csv_path) or os.path.getsize(csv_path) < 10:
-            st.error("❌ Failed to extract CSV from PDF.")
+        # Fail fast on a wrong-bank statement before extracting every page
+        try:
+            analyzer.preflight(pdf_path, selected_bank)
+        except ValueError as e:
+            st.error(f"❌ Bank Statement Validation Error: {str(e)}")
+            st.info("💡 Try using 'Auto Detect Bank' or select the correct bank for your statement.")
+            st.stop()
+
+        raw_df = analyzer.analyze(pdf_path)
+        if raw_df is None or raw_df.empty:
+            st.error("❌ Failed to extract transactions from PDF.")
             st.stop()
 
         # Override detected bank if user selected one
@@ -99,19 +109,21 @@ if st.session_state.analysis_done:
     cols = st.columns(2)
     for i in range(1, 7):
         with cols[i % 2]:
-            st.image(f"static/graph{i}.png", use_column_width=True)
+            st.image(analyzer.charts[i], use_column_width=True)
     for i in range(7, 8):  # Show daily deposit/withdrawals chart separately
-        st.image(f"static/graph{i}.png", use_column_width=True)
+        st.image(analyzer.charts[i], use_column_width=True)
 
 # Classification
 if st.session_state.analysis_done:
     if st.button("🏷️ Classify Transactions"):
         analyzer.classification()
+        # The category chart needs the labels, so draw it now that they exist
+        analyzer.charts[9] = render_graph(analyzer.df, 9)
         st.session_state.classified = True
         st.success("✅ Transactions classified and saved.")
 
 if st.session_state.classified:
-    st.image("static/graph9.png", caption="Transaction Category Distribution")
+    st.image(analyzer.charts[9], caption="Transaction Category Distribution")
 
 # Prediction
 if st.session_state.analysis_done:
@@ -145,14 +157,16 @@ if st.session_state.analysis_done:
     st.subheader("📄 Download Analysis Report")
     if st.button("📄 Generate & Download Report"):
         df = analyzer.df
-        total_withdrawals = df['Withdrawal Amount'].sum()
-        total_deposits = df['Deposit Amount'].sum()
-        current_balance = df['Closing Balance'].iloc[-1]
+        # Same totals and counts as the web app's reports
+        summary = summarize(df)
+        total_withdrawals = summary['total_withdrawals']
+        total_deposits = summary['total_deposits']
+        current_balance = summary['current_balance']
         
         # Get category data if classified
         category_data = ""
         if st.session_state.classified:
-            category_counts = df['Category'].value_counts().to_dict()
+            category_counts = summary['category_counts']
             category_data = ''.join([f'<div class="category"><strong>{cat}:</strong> {count} transactions</div>' for cat, count in category_counts.items()])
         
         # Get prediction data if available
@@ -234,5 +248,5 @@ if st.session_state.budgeted:
     st.markdown(f"- **Essential Expenses (70%):** ₹{essential_expense:.2f}")
     st.markdown(f"- **Non-Essential Expenses (30%):** ₹{non_essential_expense:.2f}")
 
-    st.image("static/graph10.png", caption="Expense Breakdown by Category")
-    st.image("static/graph11.png", caption="Budget Allocation")
+    st.image(analyzer.charts[10], caption="Expense Breakdown by Category")
+    st.image(analyzer.charts[11], caption="Budget Allocation")